@@ -45,8 +45,8 @@ def run_backtest_with_strategy(
     
     df_with_signals = strategy.generate_signals(df_with_indicators)
     
-    entries = df_with_signals["long_entry"].fillna(False)
-    exits = df_with_signals["long_exit"].fillna(False)
+    entries = df_with_signals["long_entry"].to_numpy(dtype=bool, na_value=False)
+    exits = df_with_signals["long_exit"].to_numpy(dtype=bool, na_value=False)
     
     if not entries.any():
         return None
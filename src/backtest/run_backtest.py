@@ -77,8 +77,8 @@ def run_backtest_for_symbol(
     
     backtest_config = config.get("backtest", {})
     
-    entries = df_with_signals["long_entry"].fillna(False)
-    exits = df_with_signals["long_exit"].fillna(False)
+    entries = df_with_signals["long_entry"].to_numpy(dtype=bool, na_value=False)
+    exits = df_with_signals["long_exit"].to_numpy(dtype=bool, na_value=False)
     
     if not entries.any():
         print(f"  ⚠️  No entry signals for {symbol} [{timeframe}]")
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from src.fundamentals.cache import FundamentalsCache
@@ -24,6 +25,8 @@ class FundamentalsManager:
         
         self.enabled = config.get("enabled", True)
         self.refresh_policy = config.get("refresh", "daily")
+        # Futu snapshot/kline calls are rate-limited, so concurrent fetching is opt-in
+        self.fetch_workers = config.get("fetch_workers", 1)
     
     def get_fundamentals_for_symbols(
         self,
@@ -65,14 +68,19 @@ class FundamentalsManager:
         """
         Fetch fresh fundamentals data from providers.
         Uses Futu as primary, yfinance as fallback.
+        With fetch_workers > 1, symbols are fetched concurrently by that many threads.
         """
-        result = {}
+        if self.fetch_workers <= 1 or len(symbols) <= 1:
+            return {symbol: self._fetch_symbol_metrics(symbol) for symbol in symbols}
         
-        for symbol in symbols:
-            metrics = self._fetch_symbol_metrics(symbol)
-            result[symbol] = metrics
+        # The workers share one client; connect it up front so they do not
+        # race its lazy connect and open several quote contexts
+        if self.futu_client:
+            self.futu_client.connect()
         
-        return result
+        with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(symbols))) as executor:
+            metrics = executor.map(self._fetch_symbol_metrics, symbols)
+            return dict(zip(symbols, metrics))
     
     def _fetch_symbol_metrics(self, symbol: str) -> Dict:
         """
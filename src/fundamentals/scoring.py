@@ -132,7 +132,7 @@ class FundamentalsScorer:
             else:
                 return False, "market_cap_missing", 0.0
         
-        if not all_market_caps or len(all_market_caps) == 0:
+        if all_market_caps is None or len(all_market_caps) == 0:
             return True, "no_comparison_data", 0.5
         
         valid_caps = [cap for cap in all_market_caps if cap is not None]
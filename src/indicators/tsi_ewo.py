@@ -2,6 +2,12 @@ import pandas as pd
 import numpy as np
 import pandas_ta as ta
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; crossovers fall back to the NumPy array form
+    njit = None
+
 
 def calculate_tsi(
     close: pd.Series,
@@ -87,6 +93,43 @@ def calculate_ma(close: pd.Series, length: int = 50) -> pd.Series:
     return ma
 
 
+def _crossover_kernel(values: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Flag elements above threshold whose predecessor was not above it.
+    NaN counts as not above, and the first element has no predecessor.
+    Branchless loop body, meant to be compiled with numba.
+    """
+    out = np.empty(values.shape[0], dtype=np.bool_)
+    prev_above = False
+    for i in range(values.shape[0]):
+        above = values[i] > threshold
+        out[i] = above & (not prev_above)
+        prev_above = above
+    return out
+
+
+def _crossover_vec(values: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Array form of _crossover_kernel for when numba is unavailable:
+    one comparison pass, then a shifted AND-NOT.
+    """
+    above = values > threshold
+    out = above.copy()
+    out[1:] &= ~above[:-1]
+    return out
+
+
+if njit is not None:
+    _crossover_np = njit(cache=True, nogil=True)(_crossover_kernel)
+else:
+    _crossover_np = _crossover_vec
+
+
+def _crossunder_np(values: np.ndarray, threshold: float) -> np.ndarray:
+    """Array form of detect_crossunder; x < t is -x > -t, and NaN stays not-below."""
+    return _crossover_np(-values, -threshold)
+
+
 def detect_crossover(series: pd.Series, threshold: float = 0) -> pd.Series:
     """
     Detect when a series crosses above a threshold.
@@ -98,10 +141,9 @@ def detect_crossover(series: pd.Series, threshold: float = 0) -> pd.Series:
     Returns:
         Boolean series: True when crossing above
     """
-    above = series > threshold
-    above_shifted = above.shift(1).fillna(False)
-    crossed = above & ~above_shifted
-    return crossed.fillna(False)
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    crossed = _crossover_np(values, float(threshold))
+    return pd.Series(crossed, index=series.index, name=series.name)
 
 
 def detect_crossunder(series: pd.Series, threshold: float = 0) -> pd.Series:
@@ -115,10 +157,9 @@ def detect_crossunder(series: pd.Series, threshold: float = 0) -> pd.Series:
     Returns:
         Boolean series: True when crossing below
     """
-    below = series < threshold
-    below_shifted = below.shift(1).fillna(False)
-    crossed = below & ~below_shifted
-    return crossed.fillna(False)
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    crossed = _crossunder_np(values, float(threshold))
+    return pd.Series(crossed, index=series.index, name=series.name)
 
 
 def add_all_indicators(
@@ -165,9 +206,12 @@ def add_all_indicators(
     
     df_copy["MA"] = calculate_ma(df_copy["close"], length=ma_length)
     
-    df_copy["TSI_crossover"] = detect_crossover(df_copy["TSI"], threshold=0)
-    df_copy["TSI_crossunder"] = detect_crossunder(df_copy["TSI"], threshold=0)
-    df_copy["EWO_crossover"] = detect_crossover(df_copy["EWO"], threshold=0)
-    df_copy["EWO_crossunder"] = detect_crossunder(df_copy["EWO"], threshold=0)
+    # Array kernels directly; the columns are attached without a Series round trip
+    tsi = df_copy["TSI"].to_numpy(dtype=np.float64, na_value=np.nan)
+    ewo = df_copy["EWO"].to_numpy(dtype=np.float64, na_value=np.nan)
+    df_copy["TSI_crossover"] = _crossover_np(tsi, 0.0)
+    df_copy["TSI_crossunder"] = _crossunder_np(tsi, 0.0)
+    df_copy["EWO_crossover"] = _crossover_np(ewo, 0.0)
+    df_copy["EWO_crossunder"] = _crossunder_np(ewo, 0.0)
     
     return df_copy
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Dict, List, Set, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
+import pandas as pd
 import pytz
 from dotenv import load_dotenv
 
@@ -193,12 +194,16 @@ class SignalRunner:
         
         return passed_symbols, all_metrics
     
-    def generate_signals_for_symbol(
+    def prepare_signal_frame(
         self,
         symbol: str,
         timeframe: str
-    ) -> List[Dict]:
-        """Generate signals for a single symbol and timeframe."""
+    ) -> pd.DataFrame:
+        """
+        Fetch data and add indicators and signal columns for a single
+        symbol and timeframe. Returns an empty DataFrame if there is not
+        enough data.
+        """
         lookback_days = self.config.get("lookback_days", 30)
         
         df = self.futu_client.fetch_intraday_data(
@@ -208,7 +213,7 @@ class SignalRunner:
         )
         
         if df.empty:
-            return []
+            return pd.DataFrame()
         
         df_resampled = self.futu_client.resample_to_timeframe(
             df,
@@ -217,7 +222,7 @@ class SignalRunner:
         )
         
         if df_resampled.empty or len(df_resampled) < 50:
-            return []
+            return pd.DataFrame()
         
         strategy_type = self.config.get("strategy", {}).get("type", "tsi_ewo")
         
@@ -242,13 +247,28 @@ class SignalRunner:
                 ewo_slow=ewo_config.get("slow", 35),
             )
         
-        df_with_signals = self.strategy.generate_signals(df_with_indicators)
+        return self.strategy.generate_signals(df_with_indicators)
+    
+    def extract_signals_per_symbol(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        timeframe: str
+    ) -> List[Dict]:
+        """
+        Extract the latest signals one symbol at a time.
+        A frame that fails extraction is reported and skipped.
+        """
+        signals = []
         
-        signals = self.strategy.extract_latest_signals(
-            df_with_signals,
-            symbol=symbol,
-            timeframe=timeframe
-        )
+        for symbol, df_with_signals in frames.items():
+            try:
+                signals.extend(self.strategy.extract_latest_signals(
+                    df_with_signals,
+                    symbol=symbol,
+                    timeframe=timeframe
+                ))
+            except Exception as e:
+                print(f"  ⚠️  Error processing {symbol} [{timeframe}]: {e}")
         
         return signals
     
@@ -306,13 +326,23 @@ class SignalRunner:
         
         all_signals = []
         
-        for symbol in passed_symbols:
-            for timeframe in timeframes:
+        for timeframe in timeframes:
+            frames = {}
+            for symbol in passed_symbols:
                 try:
-                    signals = self.generate_signals_for_symbol(symbol, timeframe)
-                    all_signals.extend(signals)
+                    frames[symbol] = self.prepare_signal_frame(symbol, timeframe)
                 except Exception as e:
                     print(f"  ⚠️  Error processing {symbol} [{timeframe}]: {e}")
+            
+            # Extract the whole watchlist's latest signals in one pass; one bad
+            # frame fails the whole batch, so fall back to per-symbol extraction
+            try:
+                signals = self.strategy.extract_latest_signals_batch(frames, timeframe)
+            except Exception as e:
+                print(f"  ⚠️  Batch extraction failed [{timeframe}]: {e}")
+                signals = self.extract_signals_per_symbol(frames, timeframe)
+            
+            all_signals.extend(signals)
         
         if all_signals:
             print(f"\n✅ Generated {len(all_signals)} signal(s)")
@@ -0,0 +1,320 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+import pandas as pd
+import numpy as np
+import time
+from datetime import datetime
+
+
+# Below this many rows numexpr's setup cost outweighs its single-pass gain
+NUMEXPR_MIN_ROWS = 10_000
+
+
+def _flag(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Return a boolean column as a bool ndarray (missing/NaN -> False)."""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=bool, na_value=False)
+    return np.zeros(len(df), dtype=bool)
+
+
+def _has_key(rows: Sequence[Mapping[str, Any]], name: str) -> np.ndarray:
+    """
+    Return which rows contain name as a key.
+    Rows stacked into one frame show an absent key as NaN; this tells the two apart.
+    """
+    return np.fromiter((name in row for row in rows), dtype=bool, count=len(rows))
+
+
+class SignalStrategy(ABC):
+    """
+    Base class for signal strategies.
+    
+    Holds the configuration shared by every strategy and implements the
+    fundamentals gate and latest-signal extraction on top of the
+    strategy-specific signal generation, confidence and reason methods.
+    """
+    
+    def __init__(self, config: Dict, fundamentals_manager=None):
+        self.config = config
+        self.min_confidence = config.get("min_confidence", 0.5)
+        self.filters = config.get("filters", {})
+        # Storage dtype of the signal columns; "bool[pyarrow]" stores one bit per row
+        self.signal_dtype = config.get("signal_dtype", "bool")
+        self._validate_signal_dtype()
+        self.fundamentals_manager = fundamentals_manager
+        
+        # Fundamentals move on a daily/quarterly cadence; memoize gate results
+        self.fundamentals_cache_ttl = config.get("fundamentals_cache_ttl", 3600)
+        self._fundamentals_gate_cache: Dict[str, Tuple[float, Tuple[bool, str]]] = {}
+    
+    @abstractmethod
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate trading signals from indicator data.
+        
+        Args:
+            df: DataFrame with OHLCV and indicator data
+        
+        Returns:
+            New DataFrame with added signal columns (the input is not modified)
+        """
+        pass
+    
+    @abstractmethod
+    def calculate_confidence(self, row: Mapping[str, Any]) -> float:
+        """
+        Calculate confidence score for a signal row.
+        """
+        pass
+    
+    @abstractmethod
+    def get_signal_reason(self, row: Mapping[str, Any], side: str) -> str:
+        """
+        Generate human-readable reason for a signal.
+        """
+        pass
+    
+    def _confidence_batch(self, rows: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """
+        Calculate confidence for several latest rows at once.
+        Strategies may vectorize this, but only while calculate_confidence
+        is their own; see _overrides_confidence.
+        """
+        return np.fromiter(
+            (self.calculate_confidence(row) for row in rows), dtype=float, count=len(rows)
+        )
+    
+    def _overrides_confidence(self, strategy_class: type) -> bool:
+        """
+        Return True if a subclass of strategy_class replaced its
+        calculate_confidence, so a vectorized copy of the formula no longer applies.
+        """
+        return type(self).calculate_confidence is not strategy_class.calculate_confidence
+    
+    def _validate_signal_dtype(self) -> None:
+        """
+        Resolve signal_dtype once so an unknown or unavailable dtype (such as
+        "bool[pyarrow]" without pyarrow installed) fails at construction
+        rather than on the first generate_signals call.
+        """
+        try:
+            dtype = pd.api.types.pandas_dtype(self.signal_dtype)
+        except (TypeError, ImportError) as e:
+            raise ValueError(f"Unsupported signal_dtype {self.signal_dtype!r}: {e}") from e
+        
+        if not pd.api.types.is_bool_dtype(dtype):
+            raise ValueError(f"signal_dtype must be a boolean dtype, got {self.signal_dtype!r}")
+    
+    def _assign_signals(self, df: pd.DataFrame, signals: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Attach signal masks to df as columns of the configured dtype."""
+        if self.signal_dtype != "bool":
+            signals = {side: pd.array(mask, dtype=self.signal_dtype) for side, mask in signals.items()}
+        
+        # assign() only adds the four new columns; existing ones are not deep-copied
+        return df.assign(**signals)
+    
+    def check_fundamentals_gate(self, symbol: str) -> Tuple[bool, str]:
+        """
+        Check if symbol passes fundamentals whitelist.
+        
+        Args:
+            symbol: Stock symbol to check
+        
+        Returns:
+            Tuple of (passes, reason)
+        """
+        return self.check_fundamentals_gate_many([symbol])[symbol]
+    
+    def check_fundamentals_gate_many(self, symbols: List[str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Check several symbols against the fundamentals whitelist.
+        Each symbol without a fresh memoized result is evaluated on its own,
+        exactly as check_fundamentals_gate would, so a result never depends
+        on which other symbols were checked alongside it.
+        
+        Args:
+            symbols: Stock symbols to check
+        
+        Returns:
+            Dictionary mapping symbol to (passes, reason)
+        """
+        if not self.fundamentals_manager:
+            return {symbol: (True, "fundamentals_not_configured") for symbol in symbols}
+        
+        if not self.fundamentals_manager.enabled:
+            return {symbol: (True, "fundamentals_disabled") for symbol in symbols}
+        
+        now = time.monotonic()
+        gate = {}
+        missing = []
+        
+        for symbol in symbols:
+            cached = self._fundamentals_gate_cache.get(symbol)
+            if cached is not None and now - cached[0] < self.fundamentals_cache_ttl:
+                gate[symbol] = cached[1]
+            else:
+                missing.append(symbol)
+        
+        for symbol in missing:
+            # Size percentiles are relative to the symbols passed in, so a
+            # shared build_whitelist call would change (and cache) the outcome
+            whitelisted, results = self.fundamentals_manager.build_whitelist([symbol])
+            
+            result = (True, "fundamentals_passed")
+            if symbol in results:
+                passes, reason, score = results[symbol]
+                if not passes:
+                    result = (False, f"fundamentals_gate_failed:{reason}")
+            
+            self._fundamentals_gate_cache[symbol] = (now, result)
+            gate[symbol] = result
+        
+        return gate
+    
+    def refresh_fundamentals(self) -> None:
+        """
+        Drop memoized fundamentals gate results.
+        Call after the fundamentals cache is rebuilt so symbols are re-checked.
+        """
+        self._fundamentals_gate_cache.clear()
+    
+    def extract_latest_signals(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        timeframe: str
+    ) -> List[Dict]:
+        """
+        Extract the latest signals from a DataFrame.
+        Applies fundamentals whitelist if configured.
+        
+        Returns:
+            List of signal dictionaries
+        """
+        if df.empty:
+            return []
+        
+        # Check fundamentals gate first if enabled
+        if self.fundamentals_manager and self.fundamentals_manager.enabled:
+            passes, reason = self.check_fundamentals_gate(symbol)
+            if not passes:
+                # Return suppressed signal with reason
+                return [{
+                    "timestamp": datetime.now(),
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "side": "SUPPRESSED",
+                    "price": 0,
+                    "confidence": 0,
+                    "reason": reason,
+                }]
+        
+        signals = []
+        
+        # Plain dict of the last row avoids boxing it into a Series
+        latest_row = df.tail(1).to_dict("records")[0]
+        last_index = df.index[-1]
+        timestamp = last_index if isinstance(last_index, (pd.Timestamp, datetime)) else datetime.now()
+        
+        if latest_row.get("long_entry", False):
+            confidence = self.calculate_confidence(latest_row)
+            if confidence >= self.min_confidence:
+                signals.append({
+                    "timestamp": timestamp,
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "side": "LONG",
+                    "price": latest_row["close"],
+                    "confidence": confidence,
+                    "reason": self.get_signal_reason(latest_row, "LONG"),
+                })
+        
+        if latest_row.get("short_entry", False):
+            confidence = self.calculate_confidence(latest_row)
+            if confidence >= self.min_confidence:
+                signals.append({
+                    "timestamp": timestamp,
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "side": "SHORT",
+                    "price": latest_row["close"],
+                    "confidence": confidence,
+                    "reason": self.get_signal_reason(latest_row, "SHORT"),
+                })
+        
+        return signals
+    
+    def extract_latest_signals_batch(
+        self,
+        dfs: Dict[str, pd.DataFrame],
+        timeframe: str
+    ) -> List[Dict]:
+        """
+        Extract the latest signals for a whole watchlist in one pass.
+        Produces the same signals as calling extract_latest_signals per
+        symbol, but scores confidence over all latest rows at once.
+        
+        Args:
+            dfs: Mapping of symbol to DataFrame with signal columns
+            timeframe: Timeframe label attached to each signal
+        
+        Returns:
+            List of signal dictionaries, in watchlist order
+        """
+        symbols = [symbol for symbol, df in dfs.items() if not df.empty]
+        if not symbols:
+            return []
+        
+        gate = self.check_fundamentals_gate_many(symbols)
+        passes = np.array([gate[symbol][0] for symbol in symbols], dtype=bool)
+        
+        rows = [dfs[symbol].tail(1).to_dict("records")[0] for symbol in symbols]
+        latest = pd.DataFrame.from_records(rows)
+        
+        long_mask = _flag(latest, "long_entry") & passes
+        short_mask = _flag(latest, "short_entry") & passes
+        
+        # Only score rows that carry an entry signal
+        candidates = long_mask | short_mask
+        confidence = np.zeros(len(symbols))
+        if candidates.any():
+            confidence[candidates] = self._confidence_batch(
+                [rows[i] for i in np.flatnonzero(candidates)]
+            )
+        
+        confident = confidence >= self.min_confidence
+        long_mask &= confident
+        short_mask &= confident
+        
+        signals = []
+        for i in np.flatnonzero(~passes | long_mask | short_mask):
+            symbol = symbols[i]
+            
+            if not passes[i]:
+                signals.append({
+                    "timestamp": datetime.now(),
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "side": "SUPPRESSED",
+                    "price": 0,
+                    "confidence": 0,
+                    "reason": gate[symbol][1],
+                })
+                continue
+            
+            last_index = dfs[symbol].index[-1]
+            timestamp = last_index if isinstance(last_index, (pd.Timestamp, datetime)) else datetime.now()
+            
+            for side, side_mask in (("LONG", long_mask), ("SHORT", short_mask)):
+                if side_mask[i]:
+                    signals.append({
+                        "timestamp": timestamp,
+                        "symbol": symbol,
+                        "timeframe": timeframe,
+                        "side": side,
+                        "price": rows[i]["close"],
+                        "confidence": float(confidence[i]),
+                        "reason": self.get_signal_reason(rows[i], side),
+                    })
+        
+        return signals
@@ -1,10 +1,311 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Sequence, Set, Tuple
+import math
+import operator
 import pandas as pd
 import numpy as np
-from datetime import datetime
 
+from src.strategies.base import NUMEXPR_MIN_ROWS, SignalStrategy, _flag
 
-class FusionStrategy:
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; kernels fall back to plain Python
+    njit = None
+
+try:
+    import numexpr as ne
+except ImportError:
+    # numexpr is optional; fall back to plain NumPy
+    ne = None
+
+
+# Compiled rule: (column arrays present in the frame, row count) -> boolean mask
+SignalFn = Callable[[Mapping[str, np.ndarray], int], np.ndarray]
+
+SIGNAL_COLUMNS = ("long_entry", "long_exit", "short_entry", "short_exit")
+
+# Below this many rows the pandas -> polars conversion costs more than it saves
+POLARS_MIN_ROWS = 5_000
+
+_OPERATORS = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+}
+
+# Same operators with Python semantics, for polars expressions and per-cell fallbacks
+_EXPR_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+
+def _cond(indicator: str, operator_name: str, value) -> Dict:
+    return {"type": "condition", "indicator": indicator, "operator": operator_name, "value": value}
+
+
+def _all(*rules: Dict) -> Dict:
+    return {"type": "and", "rules": list(rules)}
+
+
+def _any(*rules: Dict) -> Dict:
+    return {"type": "or", "rules": list(rules)}
+
+
+# Predefined entry/exit templates, expressed as rule trees keyed by (template, side).
+# A missing column never satisfies a condition, matching the old row.get defaults.
+TEMPLATE_RULES = {
+    # supertrend_hma: SuperTrend + HMA + RSI
+    ("supertrend_hma", "long_entry"): _all(
+        _cond("ST_trend", "==", 1), _cond("HMA_slope", ">", 0), _cond("RSI", ">", 50)
+    ),
+    ("supertrend_hma", "long_exit"): _any(
+        _cond("ST_flip_down", "==", True), _cond("RSI", "<", 45)
+    ),
+    ("supertrend_hma", "short_entry"): _all(
+        _cond("ST_trend", "==", -1), _cond("HMA_slope", "<", 0), _cond("RSI", "<", 50)
+    ),
+    ("supertrend_hma", "short_exit"): _any(
+        _cond("ST_flip_up", "==", True), _cond("RSI", ">", 55)
+    ),
+    
+    # supertrend_qqe: SuperTrend + QQE + ADX
+    ("supertrend_qqe", "long_entry"): _all(
+        _cond("ST_trend", "==", 1), _cond("QQE_long", "==", True), _cond("ADX_strong", "==", True)
+    ),
+    ("supertrend_qqe", "long_exit"): _any(
+        _cond("ST_flip_down", "==", True), _cond("QQE_short", "==", True)
+    ),
+    ("supertrend_qqe", "short_entry"): _all(
+        _cond("ST_trend", "==", -1), _cond("QQE_short", "==", True), _cond("ADX_strong", "==", True)
+    ),
+    ("supertrend_qqe", "short_exit"): _any(
+        _cond("ST_flip_up", "==", True), _cond("QQE_long", "==", True)
+    ),
+    
+    # tsi_ewo: Legacy TSI + EWO
+    ("tsi_ewo", "long_entry"): _all(
+        _cond("TSI_crossover", "==", True), _cond("EWO", ">", 0)
+    ),
+    ("tsi_ewo", "long_exit"): _any(
+        _cond("TSI_crossunder", "==", True), _cond("EWO", "<", 0)
+    ),
+    ("tsi_ewo", "short_entry"): _all(
+        _cond("TSI_crossunder", "==", True), _cond("EWO", "<", 0)
+    ),
+    ("tsi_ewo", "short_exit"): _any(
+        _cond("TSI_crossover", "==", True), _cond("EWO", ">", 0)
+    ),
+}
+
+
+def _rule_columns(rule: Dict) -> Set[str]:
+    """Return the indicator columns referenced anywhere in a rule tree."""
+    if rule.get("type", "condition") in ("and", "or"):
+        return set().union(*(_rule_columns(r) for r in rule.get("rules", [])))
+    if rule.get("type", "condition") == "condition" and rule.get("indicator"):
+        return {rule["indicator"]}
+    return set()
+
+
+def _rule_expr(rule: Dict, schema: Mapping[str, Any]) -> "pl.Expr":
+    """
+    Translate a rule tree into a polars expression over a frame with the given schema.
+    Mirrors FusionStrategy._compile_rule: missing columns and nulls evaluate to False.
+    """
+    # Only called from FusionStrategy._polars_signals, which has already imported polars
+    import polars as pl
+    
+    rule_type = rule.get("type", "condition")
+    
+    if rule_type in ("and", "or"):
+        children = [_rule_expr(r, schema) for r in rule.get("rules", [])]
+        if not children:
+            return pl.lit(rule_type == "and")
+        if rule_type == "and":
+            return pl.all_horizontal(children)
+        return pl.any_horizontal(children)
+    
+    elif rule_type == "condition":
+        indicator = rule.get("indicator")
+        operator_name = rule.get("operator", "==")
+        value = rule.get("value")
+        compare = _EXPR_OPERATORS.get(operator_name)
+        
+        if compare is None or indicator not in schema:
+            return pl.lit(False)
+        
+        column = pl.col(indicator)
+        if schema[indicator] == pl.Boolean:
+            if operator_name == "==":
+                return column == bool(value)
+            column = column.cast(pl.Float64)
+        
+        return compare(column, value).fill_null(False)
+    
+    return pl.lit(False)
+
+
+def _float_column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Return a column as a float ndarray (missing column -> all NaN)."""
+    if name in df.columns:
+        return df[name].to_numpy(dtype=float, na_value=np.nan)
+    return np.full(len(df), np.nan)
+
+
+def _make_reason_fn(
+    direction: int,
+    st_label: str,
+    hma_label: str,
+    qqe_label: str
+) -> Callable[..., str]:
+    """
+    Build the signal reason formatter for one side (direction 1 = LONG, -1 = SHORT).
+    The formatter takes the row's scalars; rsi is None when the row has no RSI.
+    """
+    def reason(st_trend, hma_slope, hma_slope_pct, rsi, qqe, adx_strong, adx) -> str:
+        reasons = []
+        if st_trend == direction:
+            reasons.append(st_label)
+        if hma_slope * direction > 0:
+            reasons.append(f"{hma_label}{hma_slope_pct:.2f}%")
+        if rsi is not None:
+            reasons.append(f"RSI={rsi:.0f}")
+        if qqe:
+            reasons.append(qqe_label)
+        if adx_strong:
+            reasons.append(f"ADX={adx:.0f}")
+        return ", ".join(reasons) if reasons else "signal_triggered"
+    
+    return reason
+
+
+# Side -> (QQE column consulted, reason formatter)
+_REASON_FNS = {
+    "LONG": ("QQE_long", _make_reason_fn(1, "ST↑", "HMA↗", "QQE+")),
+    "SHORT": ("QQE_short", _make_reason_fn(-1, "ST↓", "HMA↘", "QQE-")),
+}
+
+
+def _never(arrays: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+    """Signal function for sides that can never fire."""
+    return np.zeros(n, dtype=bool)
+
+
+def _as_float(value) -> float:
+    """Convert a scalar to float, mapping None and pd.NA to NaN."""
+    return np.nan if value is None or value is pd.NA else float(value)
+
+
+def _qqe_component(row: Mapping[str, Any]) -> float:
+    """
+    QQE input to the confidence score: 1.0 when either QQE flag is truthy
+    (NaN included), 0.0 when neither is, and NaN when the row has no QQE key.
+    """
+    if "QQE_long" in row or "QQE_short" in row:
+        return 1.0 if (row.get("QQE_long", False) or row.get("QQE_short", False)) else 0.0
+    return np.nan
+
+
+def _confidence_kernel(
+    st_trend: float,
+    hma_slope: float,
+    rsi: float,
+    adx: float,
+    qqe: float
+) -> float:
+    """
+    Score confidence from the five indicator components.
+    
+    A NaN input marks a missing component. qqe is 1.0 when either QQE flag
+    is set, 0.0 when neither is, and NaN when no QQE column exists.
+    """
+    confidence = 0.0
+    components = 0
+    
+    # SuperTrend contribution
+    if not math.isnan(st_trend):
+        if st_trend != 0:
+            confidence += 0.25
+        components += 1
+    
+    # HMA slope contribution
+    if not math.isnan(hma_slope):
+        slope_strength = min(abs(hma_slope) / 0.1, 1.0)
+        confidence += slope_strength * 0.2
+        components += 1
+    
+    # RSI contribution
+    if not math.isnan(rsi):
+        rsi_deviation = abs(rsi - 50) / 50
+        confidence += rsi_deviation * 0.2
+        components += 1
+    
+    # ADX contribution
+    if not math.isnan(adx):
+        adx_strength = min(adx / 50, 1.0)
+        confidence += adx_strength * 0.2
+        components += 1
+    
+    # QQE contribution
+    if not math.isnan(qqe):
+        if qqe != 0:
+            confidence += 0.15
+        components += 1
+    
+    # Normalize if we have fewer components
+    if components > 0 and components < 5:
+        confidence = confidence * (5 / components)
+    
+    return min(confidence, 1.0)
+
+
+if njit is not None:
+    _confidence_kernel = njit(cache=True)(_confidence_kernel)
+
+
+def _confidence_vec(
+    st_trend: np.ndarray,
+    hma_slope: np.ndarray,
+    rsi: np.ndarray,
+    adx: np.ndarray,
+    qqe: np.ndarray
+) -> np.ndarray:
+    """
+    Branchless array form of _confidence_kernel, scoring many rows at once.
+    
+    Every contribution is computed unconditionally and masked by its
+    availability, so there is no per-element control flow.
+    """
+    st_ok = ~np.isnan(st_trend)
+    hma_ok = ~np.isnan(hma_slope)
+    rsi_ok = ~np.isnan(rsi)
+    adx_ok = ~np.isnan(adx)
+    qqe_ok = ~np.isnan(qqe)
+    
+    confidence = (
+        np.where(st_ok & (st_trend != 0), 0.25, 0.0) +
+        np.where(hma_ok, np.minimum(np.abs(hma_slope) / 0.1, 1.0) * 0.2, 0.0) +
+        np.where(rsi_ok, np.abs(rsi - 50) / 50 * 0.2, 0.0) +
+        np.where(adx_ok, np.minimum(adx / 50, 1.0) * 0.2, 0.0) +
+        np.where(qqe_ok & (qqe != 0), 0.15, 0.0)
+    )
+    components = (
+        st_ok.astype(int) + hma_ok + rsi_ok + adx_ok + qqe_ok
+    )
+    
+    # Normalize if we have fewer components (5/5 leaves a full set unchanged)
+    return np.minimum(confidence * (5 / np.maximum(components, 1)), 1.0)
+
+
+class FusionStrategy(SignalStrategy):
     """
     Extensible fusion strategy that combines multiple indicators.
     
@@ -21,18 +322,74 @@ class FusionStrategy:
     """
     
     def __init__(self, config: Dict, fundamentals_manager=None):
-        self.config = config
-        self.min_confidence = config.get("min_confidence", 0.5)
+        super().__init__(config, fundamentals_manager)
         self.fusion_mode = config.get("fusion_mode", "rule_based")
         self.entry_rules = config.get("entry_rules", {})
         self.exit_rules = config.get("exit_rules", {})
         self.weights = config.get("weights", {})
-        self.filters = config.get("filters", {})
-        self.fundamentals_manager = fundamentals_manager
+        # "pandas" (default) or "polars" for rule-based scans over long frames
+        self.engine = config.get("engine", "pandas")
+        
+        # Compiled (template, side) table and per-side signal functions,
+        # resolved once since the configuration is fixed for the strategy's lifetime
+        self._template_fns = {
+            key: self._compile_rule(rule) for key, rule in TEMPLATE_RULES.items()
+        }
+        self._signal_fns = self._build_signal_fns()
+        self._signal_rules = self._build_signal_rules()
+        # Columns any configured rule reads, fetched once per generate_signals call
+        self._rule_columns = frozenset().union(
+            *(_rule_columns(rule) for rule in self._signal_rules.values())
+        )
+    
+    def _configured_sides(self) -> Iterator[Tuple[str, Dict]]:
+        """Yield (side, rule config) for every side present in the entry/exit rules."""
+        for side, rules in (
+            ("long_entry", self.entry_rules),
+            ("long_exit", self.exit_rules),
+            ("short_entry", self.entry_rules),
+            ("short_exit", self.exit_rules),
+        ):
+            if side in rules:
+                yield side, rules[side]
+    
+    def _build_signal_fns(self) -> Dict[str, SignalFn]:
+        """
+        Resolve each configured side to a function returning its boolean mask.
+        A side configured with an unknown template never fires.
+        """
+        signal_fns = {}
+        
+        for side, rule_config in self._configured_sides():
+            if "template" in rule_config:
+                signal_fns[side] = self._template_fns.get(
+                    (rule_config["template"], side), _never
+                )
+            elif "rule" in rule_config:
+                signal_fns[side] = self._compile_rule(rule_config["rule"])
+        
+        return signal_fns
+    
+    def _build_signal_rules(self) -> Dict[str, Dict]:
+        """
+        Resolve each configured side to its rule tree, for the polars engine.
+        Sides with an unknown template are left out since they never fire.
+        """
+        signal_rules = {}
+        
+        for side, rule_config in self._configured_sides():
+            if "template" in rule_config:
+                rule = TEMPLATE_RULES.get((rule_config["template"], side))
+                if rule is not None:
+                    signal_rules[side] = rule
+            elif "rule" in rule_config:
+                signal_rules[side] = rule_config["rule"]
+        
+        return signal_rules
     
-    def _evaluate_rule(self, row: pd.Series, rule: Dict) -> bool:
+    def _compile_rule(self, rule: Dict) -> SignalFn:
         """
-        Evaluate a single rule against a data row.
+        Compile a rule tree into a function evaluating it over whole columns.
         
         Rule format:
             {
@@ -42,135 +399,62 @@ class FusionStrategy:
                 "value": 1,
                 "rules": []  # for nested and/or
             }
+        
+        Returns:
+            Callable taking the frame's columns as arrays (keyed by name; absent
+            keys are missing columns) and the row count, and returning a boolean
+            mask. Missing columns and NaN values evaluate to False.
         """
         rule_type = rule.get("type", "condition")
         
-        if rule_type == "and":
-            sub_rules = rule.get("rules", [])
-            return all(self._evaluate_rule(row, r) for r in sub_rules)
-        
-        elif rule_type == "or":
-            sub_rules = rule.get("rules", [])
-            return any(self._evaluate_rule(row, r) for r in sub_rules)
+        if rule_type in ("and", "or"):
+            children = [self._compile_rule(r) for r in rule.get("rules", [])]
+            combine = np.logical_and.reduce if rule_type == "and" else np.logical_or.reduce
+            # all([]) is True, any([]) is False
+            empty_value = rule_type == "and"
+            
+            def evaluate_group(arrays: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+                if not children:
+                    return np.full(n, empty_value)
+                return combine([child(arrays, n) for child in children])
+            
+            return evaluate_group
         
         elif rule_type == "condition":
             indicator = rule.get("indicator")
-            operator = rule.get("operator", "==")
+            operator_name = rule.get("operator", "==")
             value = rule.get("value")
+            compare = _OPERATORS.get(operator_name)
+            compare_cell = _EXPR_OPERATORS.get(operator_name)
             
-            if indicator not in row.index:
-                return False
-            
-            indicator_value = row[indicator]
-            
-            if pd.isna(indicator_value):
-                return False
-            
-            # Handle boolean columns
-            if isinstance(indicator_value, (bool, np.bool_)):
-                if operator == "==":
-                    return bool(indicator_value) == bool(value)
-                else:
-                    indicator_value = float(indicator_value)
+            def evaluate_condition(arrays: Mapping[str, np.ndarray], n: int) -> np.ndarray:
+                values = arrays.get(indicator)
+                if compare is None or values is None:
+                    return np.zeros(n, dtype=bool)
+                
+                # Handle boolean columns
+                if values.dtype == bool:
+                    if operator_name == "==":
+                        return values == bool(value)
+                    values = values.astype(float)
+                
+                valid = pd.notna(values)
+                if values.dtype != object:
+                    try:
+                        return compare(values, value) & valid
+                    except TypeError:
+                        # No ufunc loop for this column/value pair, e.g. an int column vs "1"
+                        pass
+                
+                # Mixed/nullable or mismatched columns: compare valid cells one by
+                # one with Python semantics, where 1 == "1" is simply False
+                mask = np.zeros(len(values), dtype=bool)
+                mask[valid] = [bool(compare_cell(v, value)) for v in values[valid]]
+                return mask
             
-            # Evaluate condition
-            if operator == "==":
-                return indicator_value == value
-            elif operator == "!=":
-                return indicator_value != value
-            elif operator == ">":
-                return indicator_value > value
-            elif operator == "<":
-                return indicator_value < value
-            elif operator == ">=":
-                return indicator_value >= value
-            elif operator == "<=":
-                return indicator_value <= value
-            else:
-                return False
+            return evaluate_condition
         
-        return False
-    
-    def _apply_template(self, row: pd.Series, template: str, side: str) -> bool:
-        """
-        Apply a predefined entry/exit template.
-        
-        Templates:
-            - supertrend_hma: SuperTrend + HMA + RSI
-            - supertrend_qqe: SuperTrend + QQE + ADX
-            - tsi_ewo: Legacy TSI + EWO
-        """
-        if template == "supertrend_hma":
-            if side == "long_entry":
-                return (
-                    row.get("ST_trend", 0) == 1 and
-                    row.get("HMA_slope", 0) > 0 and
-                    row.get("RSI", 50) > 50
-                )
-            elif side == "long_exit":
-                return (
-                    row.get("ST_flip_down", False) or
-                    row.get("RSI", 50) < 45
-                )
-            elif side == "short_entry":
-                return (
-                    row.get("ST_trend", 0) == -1 and
-                    row.get("HMA_slope", 0) < 0 and
-                    row.get("RSI", 50) < 50
-                )
-            elif side == "short_exit":
-                return (
-                    row.get("ST_flip_up", False) or
-                    row.get("RSI", 50) > 55
-                )
-        
-        elif template == "supertrend_qqe":
-            if side == "long_entry":
-                return (
-                    row.get("ST_trend", 0) == 1 and
-                    row.get("QQE_long", False) and
-                    row.get("ADX_strong", False)
-                )
-            elif side == "long_exit":
-                return (
-                    row.get("ST_flip_down", False) or
-                    row.get("QQE_short", False)
-                )
-            elif side == "short_entry":
-                return (
-                    row.get("ST_trend", 0) == -1 and
-                    row.get("QQE_short", False) and
-                    row.get("ADX_strong", False)
-                )
-            elif side == "short_exit":
-                return (
-                    row.get("ST_flip_up", False) or
-                    row.get("QQE_long", False)
-                )
-        
-        elif template == "tsi_ewo":
-            if side == "long_entry":
-                return (
-                    row.get("TSI_crossover", False) and
-                    row.get("EWO", 0) > 0
-                )
-            elif side == "long_exit":
-                return (
-                    row.get("TSI_crossunder", False) or
-                    row.get("EWO", 0) < 0
-                )
-            elif side == "short_entry":
-                return (
-                    row.get("TSI_crossunder", False) and
-                    row.get("EWO", 0) < 0
-                )
-            elif side == "short_exit":
-                return (
-                    row.get("TSI_crossover", False) or
-                    row.get("EWO", 0) > 0
-                )
-        
-        return False
+        return _never
     
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -180,107 +464,150 @@ class FusionStrategy:
             df: DataFrame with OHLCV and indicator data
             
         Returns:
-            DataFrame with added signal columns
+            New DataFrame with added signal columns (the input is not modified)
         """
-        df_copy = df.copy()
-        
-        # Initialize signal columns
-        df_copy["long_entry"] = False
-        df_copy["long_exit"] = False
-        df_copy["short_entry"] = False
-        df_copy["short_exit"] = False
+        signals = {side: np.zeros(len(df), dtype=bool) for side in SIGNAL_COLUMNS}
         
         if self.fusion_mode == "rule_based":
-            # Apply rule-based fusion
-            for idx, row in df_copy.iterrows():
-                # Long entry
-                if "long_entry" in self.entry_rules:
-                    entry_config = self.entry_rules["long_entry"]
-                    
-                    if "template" in entry_config:
-                        df_copy.at[idx, "long_entry"] = self._apply_template(
-                            row, entry_config["template"], "long_entry"
-                        )
-                    elif "rule" in entry_config:
-                        df_copy.at[idx, "long_entry"] = self._evaluate_rule(
-                            row, entry_config["rule"]
-                        )
-                
-                # Long exit
-                if "long_exit" in self.exit_rules:
-                    exit_config = self.exit_rules["long_exit"]
-                    
-                    if "template" in exit_config:
-                        df_copy.at[idx, "long_exit"] = self._apply_template(
-                            row, exit_config["template"], "long_exit"
-                        )
-                    elif "rule" in exit_config:
-                        df_copy.at[idx, "long_exit"] = self._evaluate_rule(
-                            row, exit_config["rule"]
-                        )
-                
-                # Short entry
-                if "short_entry" in self.entry_rules:
-                    entry_config = self.entry_rules["short_entry"]
-                    
-                    if "template" in entry_config:
-                        df_copy.at[idx, "short_entry"] = self._apply_template(
-                            row, entry_config["template"], "short_entry"
-                        )
-                    elif "rule" in entry_config:
-                        df_copy.at[idx, "short_entry"] = self._evaluate_rule(
-                            row, entry_config["rule"]
-                        )
+            if not self._signal_fns:
+                # No rules configured: nothing can fire, so filters are moot
+                return self._assign_signals(df, signals)
+            
+            polars_signals = self._polars_signals(df)
+            if polars_signals is not None:
+                signals.update(polars_signals)
+            else:
+                # Resolve each referenced column once, shared by every side
+                arrays = {
+                    name: df[name].to_numpy() for name in self._rule_columns if name in df.columns
+                }
                 
-                # Short exit
-                if "short_exit" in self.exit_rules:
-                    exit_config = self.exit_rules["short_exit"]
-                    
-                    if "template" in exit_config:
-                        df_copy.at[idx, "short_exit"] = self._apply_template(
-                            row, exit_config["template"], "short_exit"
-                        )
-                    elif "rule" in exit_config:
-                        df_copy.at[idx, "short_exit"] = self._evaluate_rule(
-                            row, exit_config["rule"]
-                        )
+                # Apply rule-based fusion, one mask per configured side only
+                for side, signal_fn in self._signal_fns.items():
+                    signals[side] = signal_fn(arrays, len(df))
         
         elif self.fusion_mode == "weighted":
             # Apply weighted fusion (simple implementation)
-            # Calculate weighted signal strength
-            signal_strength = pd.Series(0.0, index=df_copy.index)
-            
-            for indicator, weight in self.weights.items():
-                if indicator in df_copy.columns:
-                    # Normalize indicator to -1 to 1 range if needed
-                    signal_strength += df_copy[indicator] * weight
+            # Calculate weighted signal strength in a single pass
+            signal_strength = self._weighted_strength(df)
             
             # Generate signals based on threshold
             threshold = self.config.get("threshold", 0)
-            df_copy["long_entry"] = signal_strength > threshold
-            df_copy["short_entry"] = signal_strength < -threshold
-            df_copy["long_exit"] = signal_strength < -threshold / 2
-            df_copy["short_exit"] = signal_strength > threshold / 2
-        
-        # Apply filters
-        if self.filters.get("use_atr_filter", False):
-            if "ATR_accept" in df_copy.columns:
-                df_copy["long_entry"] = df_copy["long_entry"] & df_copy["ATR_accept"]
-                df_copy["short_entry"] = df_copy["short_entry"] & df_copy["ATR_accept"]
-        
-        if self.filters.get("use_adx_filter", False):
-            if "ADX_strong" in df_copy.columns:
-                df_copy["long_entry"] = df_copy["long_entry"] & df_copy["ADX_strong"]
-                df_copy["short_entry"] = df_copy["short_entry"] & df_copy["ADX_strong"]
+            signals["long_entry"] = signal_strength > threshold
+            signals["short_entry"] = signal_strength < -threshold
+            signals["long_exit"] = signal_strength < -threshold / 2
+            signals["short_exit"] = signal_strength > threshold / 2
+        
+        # Apply the combined filters in place on the entry masks
+        entry_filter = self._entry_filter(df)
+        if entry_filter is not None:
+            signals["long_entry"] &= entry_filter
+            signals["short_entry"] &= entry_filter
+        
+        return self._assign_signals(df, signals)
+    
+    def _polars_signals(self, df: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Evaluate the configured rules as one lazy polars query.
+        
+        Returns:
+            Masks per configured side, or None when the pandas path should be
+            used instead (engine not selected, polars missing, short frame, or
+            referenced columns that are not plain NumPy-backed)
+        """
+        if self.engine != "polars" or len(df) < POLARS_MIN_ROWS:
+            return None
+        
+        try:
+            # Imported on first use: polars is optional and slow to import
+            import polars as pl
+        except ImportError:
+            # engine="polars" falls back to pandas
+            return None
+        
+        columns = [name for name in df.columns if name in self._rule_columns]
+        if not columns or not all(
+            isinstance(df[name].dtype, np.dtype) and df[name].dtype.kind in "biuf"
+            for name in columns
+        ):
+            return None
+        
+        frame = pl.from_pandas(df[columns], nan_to_null=True).lazy()
+        schema = frame.collect_schema()
+        try:
+            result = frame.with_columns(
+                _rule_expr(rule, schema).alias(side) for side, rule in self._signal_rules.items()
+            ).select(list(self._signal_rules)).collect()
+        except pl.exceptions.PolarsError:
+            # The query cannot evaluate a rule, e.g. an int column compared with
+            # "1" (the error class varies across polars versions); the pandas
+            # path gives such comparisons Python semantics
+            return None
+        
+        return {side: result[side].to_numpy() for side in self._signal_rules}
+    
+    def _entry_filter(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Combine the enabled ATR/ADX/volume filters into one mask.
+        Long frames are evaluated as one fused numexpr expression.
+        
+        Returns:
+            Boolean mask of rows passing every filter, or None if no filter applies
+        """
+        parts = {}
+        
+        if self.filters.get("use_atr_filter", False) and "ATR_accept" in df.columns:
+            parts["atr"] = _flag(df, "ATR_accept")
+        
+        if self.filters.get("use_adx_filter", False) and "ADX_strong" in df.columns:
+            parts["adx"] = _flag(df, "ADX_strong")
         
         min_volume = self.filters.get("min_volume", 0)
         if min_volume > 0:
-            df_copy["long_entry"] = df_copy["long_entry"] & (df_copy["volume"] >= min_volume)
-            df_copy["short_entry"] = df_copy["short_entry"] & (df_copy["volume"] >= min_volume)
+            volume = df["volume"].to_numpy()
+            if ne is not None and len(df) >= NUMEXPR_MIN_ROWS:
+                parts["volume"] = volume
+            else:
+                parts["volume"] = volume >= min_volume
+        
+        if not parts:
+            return None
+        
+        if ne is not None and len(df) >= NUMEXPR_MIN_ROWS:
+            expression = " & ".join(
+                "(volume >= min_volume)" if name == "volume" else name for name in parts
+            )
+            # Thresholds go in as variables; their repr (e.g. np.int64(5000)) is not numexpr syntax
+            return ne.evaluate(expression, local_dict={**parts, "min_volume": min_volume})
         
-        return df_copy
+        return np.logical_and.reduce(list(parts.values()))
     
-    def calculate_confidence(self, row: pd.Series) -> float:
+    def _weighted_strength(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Weighted sum of the configured indicator columns present in df.
+        Long frames are evaluated as one fused numexpr expression.
+        """
+        columns = [
+            (df[indicator].to_numpy(dtype=float, na_value=np.nan), weight)
+            for indicator, weight in self.weights.items()
+            if indicator in df.columns
+        ]
+        
+        if ne is not None and columns and len(df) >= NUMEXPR_MIN_ROWS:
+            expression = " + ".join(f"w{i} * x{i}" for i in range(len(columns)))
+            # Weights go in as variables, so non-finite or NumPy scalar weights need no formatting
+            local_dict = {}
+            for i, (values, weight) in enumerate(columns):
+                local_dict[f"x{i}"] = values
+                local_dict[f"w{i}"] = float(weight)
+            return ne.evaluate(expression, local_dict=local_dict)
+        
+        signal_strength = np.zeros(len(df))
+        for values, weight in columns:
+            signal_strength += values * weight
+        return signal_strength
+    
+    def calculate_confidence(self, row: Mapping[str, Any]) -> float:
         """
         Calculate confidence score for a signal.
         
@@ -289,161 +616,50 @@ class FusionStrategy:
             - Trend strength (ADX)
             - Volatility regime (ATR)
         """
-        confidence = 0.0
-        components = 0
-        
-        # SuperTrend contribution
-        if "ST_trend" in row.index and pd.notna(row["ST_trend"]):
-            if row["ST_trend"] != 0:
-                confidence += 0.25
-            components += 1
-        
-        # HMA slope contribution
-        if "HMA_slope" in row.index and pd.notna(row["HMA_slope"]):
-            slope_strength = min(abs(row["HMA_slope"]) / 0.1, 1.0)
-            confidence += slope_strength * 0.2
-            components += 1
-        
-        # RSI contribution
-        if "RSI" in row.index and pd.notna(row["RSI"]):
-            rsi_deviation = abs(row["RSI"] - 50) / 50
-            confidence += rsi_deviation * 0.2
-            components += 1
-        
-        # ADX contribution
-        if "ADX" in row.index and pd.notna(row["ADX"]):
-            adx_strength = min(row["ADX"] / 50, 1.0)
-            confidence += adx_strength * 0.2
-            components += 1
-        
-        # QQE contribution
-        if "QQE_long" in row.index or "QQE_short" in row.index:
-            if row.get("QQE_long", False) or row.get("QQE_short", False):
-                confidence += 0.15
-            components += 1
-        
-        # Normalize if we have fewer components
-        if components > 0 and components < 5:
-            confidence = confidence * (5 / components)
-        
-        return min(confidence, 1.0)
-    
-    def get_signal_reason(self, row: pd.Series, side: str) -> str:
-        """
-        Generate human-readable reason for a signal.
-        """
-        reasons = []
-        
-        if side == "LONG":
-            if row.get("ST_trend", 0) == 1:
-                reasons.append("ST↑")
-            if row.get("HMA_slope", 0) > 0:
-                reasons.append(f"HMA↗{row.get('HMA_slope_pct', 0):.2f}%")
-            if "RSI" in row.index:
-                reasons.append(f"RSI={row['RSI']:.0f}")
-            if row.get("QQE_long", False):
-                reasons.append("QQE+")
-            if row.get("ADX_strong", False):
-                reasons.append(f"ADX={row.get('ADX', 0):.0f}")
-        
-        elif side == "SHORT":
-            if row.get("ST_trend", 0) == -1:
-                reasons.append("ST↓")
-            if row.get("HMA_slope", 0) < 0:
-                reasons.append(f"HMA↘{row.get('HMA_slope_pct', 0):.2f}%")
-            if "RSI" in row.index:
-                reasons.append(f"RSI={row['RSI']:.0f}")
-            if row.get("QQE_short", False):
-                reasons.append("QQE-")
-            if row.get("ADX_strong", False):
-                reasons.append(f"ADX={row.get('ADX', 0):.0f}")
-        
-        return ", ".join(reasons) if reasons else "signal_triggered"
+        return _confidence_kernel(
+            _as_float(row.get("ST_trend")),
+            _as_float(row.get("HMA_slope")),
+            _as_float(row.get("RSI")),
+            _as_float(row.get("ADX")),
+            _qqe_component(row),
+        )
     
-    def check_fundamentals_gate(self, symbol: str) -> Tuple[bool, str]:
+    def _confidence_batch(self, rows: Sequence[Mapping[str, Any]]) -> np.ndarray:
         """
-        Check if symbol passes fundamentals whitelist.
-        
-        Args:
-            symbol: Stock symbol to check
-            
-        Returns:
-            Tuple of (passes, reason)
+        Calculate confidence for several latest rows at once.
+        Absent columns and NaN values count as missing components, except
+        a NaN QQE flag, which counts as set as in calculate_confidence.
         """
-        if not self.fundamentals_manager:
-            return True, "fundamentals_not_configured"
-        
-        if not self.fundamentals_manager.enabled:
-            return True, "fundamentals_disabled"
-        
-        symbols = [symbol]
-        whitelisted, results = self.fundamentals_manager.build_whitelist(symbols)
-        
-        if symbol in results:
-            passes, reason, score = results[symbol]
-            if not passes:
-                return False, f"fundamentals_gate_failed:{reason}"
-        
-        return True, "fundamentals_passed"
+        if self._overrides_confidence(FusionStrategy):
+            # Custom scoring: score each row with the subclass's method
+            return super()._confidence_batch(rows)
+        
+        latest = pd.DataFrame.from_records(rows)
+        # Stacked rows show a missing QQE key and a NaN flag alike, so read the row dicts
+        qqe = np.fromiter((_qqe_component(row) for row in rows), dtype=float, count=len(rows))
+        
+        return _confidence_vec(
+            _float_column(latest, "ST_trend"),
+            _float_column(latest, "HMA_slope"),
+            _float_column(latest, "RSI"),
+            _float_column(latest, "ADX"),
+            qqe,
+        )
     
-    def extract_latest_signals(
-        self,
-        df: pd.DataFrame,
-        symbol: str,
-        timeframe: str
-    ) -> List[Dict]:
+    def get_signal_reason(self, row: Mapping[str, Any], side: str) -> str:
         """
-        Extract the latest signals from a DataFrame.
-        Applies fundamentals whitelist if configured.
-        
-        Returns:
-            List of signal dictionaries
+        Generate human-readable reason for a signal.
         """
-        if df.empty:
-            return []
-        
-        # Check fundamentals gate first if enabled
-        if self.fundamentals_manager and self.fundamentals_manager.enabled:
-            passes, reason = self.check_fundamentals_gate(symbol)
-            if not passes:
-                return [{
-                    "timestamp": datetime.now(),
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "side": "SUPPRESSED",
-                    "price": 0,
-                    "confidence": 0,
-                    "reason": reason,
-                }]
-        
-        signals = []
-        latest_row = df.iloc[-1]
-        timestamp = latest_row.name if isinstance(latest_row.name, (pd.Timestamp, datetime)) else datetime.now()
-        
-        if latest_row.get("long_entry", False):
-            confidence = self.calculate_confidence(latest_row)
-            if confidence >= self.min_confidence:
-                signals.append({
-                    "timestamp": timestamp,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "side": "LONG",
-                    "price": latest_row["close"],
-                    "confidence": confidence,
-                    "reason": self.get_signal_reason(latest_row, "LONG"),
-                })
-        
-        if latest_row.get("short_entry", False):
-            confidence = self.calculate_confidence(latest_row)
-            if confidence >= self.min_confidence:
-                signals.append({
-                    "timestamp": timestamp,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "side": "SHORT",
-                    "price": latest_row["close"],
-                    "confidence": confidence,
-                    "reason": self.get_signal_reason(latest_row, "SHORT"),
-                })
-        
-        return signals
+        if side not in _REASON_FNS:
+            return "signal_triggered"
+        
+        qqe_column, reason_fn = _REASON_FNS[side]
+        return reason_fn(
+            row.get("ST_trend", 0),
+            row.get("HMA_slope", 0),
+            row.get("HMA_slope_pct", 0),
+            row["RSI"] if "RSI" in row else None,
+            row.get(qqe_column, False),
+            row.get("ADX_strong", False),
+            row.get("ADX", 0),
+        )
@@ -1,10 +1,22 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Mapping, Sequence
 import pandas as pd
 import numpy as np
-from datetime import datetime
 
+from src.strategies.base import NUMEXPR_MIN_ROWS, SignalStrategy, _has_key
 
-class TSIEWOStrategy:
+try:
+    import numexpr as ne
+except ImportError:
+    # numexpr is optional; fall back to plain NumPy
+    ne = None
+
+
+def _is_missing(value) -> bool:
+    """Scalar None/pd.NA/NaN check; NaN is the only value not equal to itself."""
+    return value is None or value is pd.NA or value != value
+
+
+class TSIEWOStrategy(SignalStrategy):
     """
     TSI/EWO crossover strategy.
     
@@ -17,12 +29,6 @@ class TSIEWOStrategy:
         - SHORT exit: TSI crosses above 0 OR EWO > 0
     """
     
-    def __init__(self, config: Dict, fundamentals_manager=None):
-        self.config = config
-        self.min_confidence = config.get("min_confidence", 0.5)
-        self.filters = config.get("filters", {})
-        self.fundamentals_manager = fundamentals_manager
-    
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Generate trading signals from indicator data.
@@ -31,42 +37,47 @@ class TSIEWOStrategy:
             df: DataFrame with OHLCV and indicators
             
         Returns:
-            DataFrame with added signal columns
+            New DataFrame with added signal columns (the input is not modified)
         """
-        df_copy = df.copy()
-        
-        df_copy["long_entry"] = (
-            df_copy["TSI_crossover"] &
-            (df_copy["EWO"] > 0)
-        )
-        
-        df_copy["long_exit"] = (
-            df_copy["TSI_crossunder"] |
-            (df_copy["EWO"] < 0)
-        )
-        
-        df_copy["short_entry"] = (
-            df_copy["TSI_crossunder"] &
-            (df_copy["EWO"] < 0)
-        )
-        
-        df_copy["short_exit"] = (
-            df_copy["TSI_crossover"] |
-            (df_copy["EWO"] > 0)
-        )
+        tsi_x = df["TSI_crossover"].to_numpy(dtype=bool, na_value=False)
+        tsi_u = df["TSI_crossunder"].to_numpy(dtype=bool, na_value=False)
+        ewo = df["EWO"].to_numpy(dtype=float, na_value=np.nan)
+        
+        if ne is not None and len(df) >= NUMEXPR_MIN_ROWS:
+            # Fused single-pass evaluation, no intermediate boolean arrays
+            long_entry = ne.evaluate("tsi_x & (ewo > 0)")
+            long_exit = ne.evaluate("tsi_u | (ewo < 0)")
+            short_entry = ne.evaluate("tsi_u & (ewo < 0)")
+            short_exit = ne.evaluate("tsi_x | (ewo > 0)")
+        else:
+            ewo_pos = ewo > 0
+            ewo_neg = ewo < 0
+            long_entry = tsi_x & ewo_pos
+            long_exit = tsi_u | ewo_neg
+            short_entry = tsi_u & ewo_neg
+            short_exit = tsi_x | ewo_pos
         
         if self.filters.get("use_ma_trend", False):
-            df_copy["long_entry"] = df_copy["long_entry"] & (df_copy["close"] > df_copy["MA"])
-            df_copy["short_entry"] = df_copy["short_entry"] & (df_copy["close"] < df_copy["MA"])
+            close = df["close"].to_numpy()
+            ma = df["MA"].to_numpy()
+            long_entry &= close > ma
+            short_entry &= close < ma
         
         min_volume = self.filters.get("min_volume", 0)
         if min_volume > 0:
-            df_copy["long_entry"] = df_copy["long_entry"] & (df_copy["volume"] >= min_volume)
-            df_copy["short_entry"] = df_copy["short_entry"] & (df_copy["volume"] >= min_volume)
-        
-        return df_copy
+            volume_ok = df["volume"].to_numpy() >= min_volume
+            long_entry &= volume_ok
+            short_entry &= volume_ok
+        
+        signals = {
+            "long_entry": long_entry,
+            "long_exit": long_exit,
+            "short_entry": short_entry,
+            "short_exit": short_exit,
+        }
+        return self._assign_signals(df, signals)
     
-    def calculate_confidence(self, row: pd.Series) -> float:
+    def calculate_confidence(self, row: Mapping[str, Any]) -> float:
         """
         Calculate confidence score for a signal.
         
@@ -84,7 +95,7 @@ class TSIEWOStrategy:
         confidence += tsi_confidence
         
         ewo_confidence = 0.3
-        if "EWO" in row.index and not pd.isna(ewo):
+        if "EWO" in row and not _is_missing(ewo):
             ewo_confidence = min(abs(ewo) / 10, 1.0) * 0.3
         confidence += ewo_confidence
         
@@ -92,9 +103,37 @@ class TSIEWOStrategy:
         
         return min(confidence, 1.0)
     
+    def _confidence_batch(self, rows: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """
+        Calculate confidence for several latest rows at once.
+        """
+        if self._overrides_confidence(TSIEWOStrategy):
+            # Custom scoring: score each row with the subclass's method
+            return super()._confidence_batch(rows)
+        
+        latest = pd.DataFrame.from_records(rows)
+        
+        # Rows without a TSI key score it as 0, like row.get("TSI", 0)
+        tsi = np.zeros(len(latest))
+        if "TSI" in latest.columns:
+            has_tsi = _has_key(rows, "TSI")
+            tsi[has_tsi] = latest["TSI"].to_numpy(dtype=float, na_value=np.nan)[has_tsi]
+        
+        if "EWO" in latest.columns:
+            ewo = latest["EWO"].to_numpy(dtype=float, na_value=np.nan)
+        else:
+            ewo = np.full(len(latest), np.nan)
+        
+        tsi_confidence = np.minimum(np.abs(tsi) / 50, 1.0) * 0.4
+        ewo_confidence = np.where(
+            np.isnan(ewo), 0.3, np.minimum(np.abs(ewo) / 10, 1.0) * 0.3
+        )
+        
+        return np.minimum(tsi_confidence + ewo_confidence + 0.3, 1.0)
+    
     def get_signal_reason(
         self,
-        row: pd.Series,
+        row: Mapping[str, Any],
         side: str
     ) -> str:
         """
@@ -130,96 +169,3 @@ class TSIEWOStrategy:
                     reasons.append("P<MA")
         
         return ", ".join(reasons)
-    
-    def check_fundamentals_gate(self, symbol: str) -> Tuple[bool, str]:
-        """
-        Check if symbol passes fundamentals whitelist.
-        
-        Args:
-            symbol: Stock symbol to check
-            
-        Returns:
-            Tuple of (passes, reason)
-        """
-        if not self.fundamentals_manager:
-            return True, "fundamentals_not_configured"
-        
-        if not self.fundamentals_manager.enabled:
-            return True, "fundamentals_disabled"
-        
-        # Get all symbols to build context for percentile calculation
-        # In real usage, this would come from the watchlist
-        symbols = [symbol]
-        
-        whitelisted, results = self.fundamentals_manager.build_whitelist(symbols)
-        
-        if symbol in results:
-            passes, reason, score = results[symbol]
-            if not passes:
-                return False, f"fundamentals_gate_failed:{reason}"
-        
-        return True, "fundamentals_passed"
-    
-    def extract_latest_signals(
-        self,
-        df: pd.DataFrame,
-        symbol: str,
-        timeframe: str
-    ) -> List[Dict]:
-        """
-        Extract the latest signals from a DataFrame.
-        Applies fundamentals whitelist if configured.
-        
-        Returns:
-            List of signal dictionaries
-        """
-        if df.empty:
-            return []
-        
-        # Check fundamentals gate first if enabled
-        if self.fundamentals_manager and self.fundamentals_manager.enabled:
-            passes, reason = self.check_fundamentals_gate(symbol)
-            if not passes:
-                # Return suppressed signal with reason
-                return [{
-                    "timestamp": datetime.now(),
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "side": "SUPPRESSED",
-                    "price": 0,
-                    "confidence": 0,
-                    "reason": reason,
-                }]
-        
-        signals = []
-        
-        latest_row = df.iloc[-1]
-        timestamp = latest_row.name if isinstance(latest_row.name, (pd.Timestamp, datetime)) else datetime.now()
-        
-        if latest_row.get("long_entry", False):
-            confidence = self.calculate_confidence(latest_row)
-            if confidence >= self.min_confidence:
-                signals.append({
-                    "timestamp": timestamp,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "side": "LONG",
-                    "price": latest_row["close"],
-                    "confidence": confidence,
-                    "reason": self.get_signal_reason(latest_row, "LONG"),
-                })
-        
-        if latest_row.get("short_entry", False):
-            confidence = self.calculate_confidence(latest_row)
-            if confidence >= self.min_confidence:
-                signals.append({
-                    "timestamp": timestamp,
-                    "symbol": symbol,
-                    "timeframe": timeframe,
-                    "side": "SHORT",
-                    "price": latest_row["close"],
-                    "confidence": confidence,
-                    "reason": self.get_signal_reason(latest_row, "SHORT"),
-                })
-        
-        return signals
@@ -0,0 +1,158 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+
+def pytest_sessionstart(session):
+    """
+    Compile the numba kernels before any test runs, so JIT latency is not
+    charged to whichever test happens to call them first. With cache=True
+    later sessions load them from disk. Modules whose dependencies are not
+    installed are skipped; their tests report the import error themselves.
+    """
+    try:
+        from src.indicators.tsi_ewo import detect_crossover, detect_crossunder
+    except ImportError:
+        pass
+    else:
+        warm = pd.Series([0.0, 1.0])
+        detect_crossover(warm)
+        detect_crossunder(warm)
+    
+    try:
+        from src.strategies.fusion import FusionStrategy
+    except ImportError:
+        pass
+    else:
+        FusionStrategy({}).calculate_confidence({"ST_trend": 1, "RSI": 60.0})
+
+
+def _freeze(value):
+    """Convert a nested config into a hashable key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@pytest.fixture(scope="session")
+def scorer_factory():
+    """
+    Return a function building FundamentalsScorer instances, memoized by config.
+    Scorers only read their config, so one instance per distinct config is shared.
+    Shared module-level configs are looked up by identity first, which skips
+    freezing them into a key on every call; they must not be mutated.
+    """
+    # Imported lazily so collecting unrelated tests does not pull in futu
+    from src.fundamentals.scoring import FundamentalsScorer
+    
+    scorers = {}
+    # id(config) -> (config, scorer); holding config keeps its id from being reused
+    by_identity = {}
+    
+    def factory(config):
+        cached = by_identity.get(id(config))
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        
+        key = _freeze(config)
+        if key not in scorers:
+            scorers[key] = FundamentalsScorer(config)
+        by_identity[id(config)] = (config, scorers[key])
+        return scorers[key]
+    
+    return factory
+
+
+class _CountingFundamentalsManager:
+    """Minimal fundamentals manager that records build_whitelist calls."""
+    
+    enabled = True
+    
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = 0
+    
+    def build_whitelist(self, symbols):
+        self.calls += 1
+        results = {
+            s: (False, "pe_out_of_range", 0.0) if s in self.failing else (True, "passed", 0.8)
+            for s in symbols
+        }
+        return [s for s in symbols if s not in self.failing], results
+
+
+@pytest.fixture(scope="session")
+def counting_manager():
+    """
+    Return the fake fundamentals manager class; instances fail the symbols
+    given in failing and count build_whitelist calls in calls.
+    """
+    return _CountingFundamentalsManager
+
+
+_DATES = pd.date_range("2024-01-01", periods=50, freq="1h")
+
+
+def create_sample_data():
+    """Create sample data with indicators."""
+    rng = np.random.default_rng(42)
+    
+    # One (4, 50) draw for the open/high/low/close random walks
+    noise = rng.standard_normal((4, 50)).cumsum(axis=1) * 0.5
+    open_, high, low, close = np.array([100, 102, 98, 100])[:, None] + noise
+    
+    df = pd.DataFrame({
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.integers(1000, 10000, 50),
+        # Indicator columns
+        "ST_trend": np.repeat([1, -1], 25),
+        "ST_flip_up": np.eye(1, 50, 24, dtype=bool).ravel(),
+        "ST_flip_down": np.eye(1, 50, 25, dtype=bool).ravel(),
+        "HMA_slope": np.linspace(0.1, -0.1, 50),
+        "HMA_slope_pct": np.linspace(0.1, -0.1, 50),
+        "RSI": np.linspace(60, 40, 50),
+        "QQE_long": np.repeat([True, False], 25),
+        "QQE_short": np.repeat([False, True], 25),
+        "ADX": np.linspace(30, 20, 50),
+        "ADX_strong": np.repeat([True, False], [30, 20]),
+        "ATR_accept": np.ones(50, dtype=bool)
+    }, index=_DATES, copy=False)
+    
+    return df
+
+
+@pytest.fixture(scope="session")
+def sample_df():
+    """Sample indicator frame shared by the session; tests that modify it take a copy."""
+    return create_sample_data()
+
+
+@pytest.fixture(scope="session")
+def ohlcv_100():
+    """
+    100 hourly OHLCV bars shared by the session.
+    Indicators copy their input, so tests may pass this frame to them directly.
+    """
+    dates = pd.date_range("2024-01-01", periods=100, freq="1h")
+    rng = np.random.default_rng(42)
+    
+    # open/high/low/close random walks as one (4, 100) draw; float32 is
+    # plenty for indicator smoke tests, and indicators upcast if they need to
+    walks = rng.standard_normal((4, 100), dtype=np.float32).cumsum(axis=1) + np.float32(100)
+    walks[1] += 1
+    walks[2] -= 1
+    open_, high, low, close = walks
+    
+    # Ensure high >= low; the arrays are fresh, so the frame can adopt them uncopied
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(np.maximum(open_, high), close),
+        "low": np.minimum(np.minimum(open_, low), close),
+        "close": close,
+        "volume": rng.integers(1000, 10000, 100)
+    }, index=dates, copy=False)
@@ -1,5 +1,6 @@
-import pytest
+import threading
 import pandas as pd
+import pytest
 from src.strategies.tsi_ewo_strategy import TSIEWOStrategy
 from src.fundamentals.manager import FundamentalsManager
 
@@ -96,3 +97,112 @@ def test_fundamentals_manager_basic():
     assert len(results) == 2
     assert "US.AAPL" in results
     assert "HK.00700" in results
+
+
+class _StaticFundamentalsManager(FundamentalsManager):
+    """FundamentalsManager scoring fixed metrics instead of fetching them."""
+    
+    def __init__(self, config, metrics):
+        super().__init__(config, futu_client=None)
+        self.metrics = metrics
+    
+    def get_fundamentals_for_symbols(self, symbols, force_refresh=False):
+        return {s: self.metrics[s] for s in symbols if s in self.metrics}
+
+
+_GATE_CONFIG = {
+    "enabled": True,
+    "thresholds": {
+        "liquidity": {"min": 50_000_000},
+        "global": {"pe_min": 0, "pe_max": 60, "pb_max": 10, "cap_percentile_min": 0.5},
+        "overrides": {}
+    },
+    "scoring": {
+        "weights": {"size": 0.4, "pe": 0.3, "pb": 0.3},
+        "min_score": 0.5
+    },
+    "gate_behavior_on_missing": "pass"
+}
+
+# Market caps from smallest to largest; valuation and liquidity all pass
+_GATE_METRICS = {
+    symbol: {"pe": 15, "pb": 2, "market_cap": cap, "turnover_20d_avg": 100_000_000}
+    for symbol, cap in [
+        ("HK.00002", 1e9), ("HK.00005", 5e9), ("HK.00700", 1e10), ("HK.09988", 5e10)
+    ]
+}
+
+
+@pytest.mark.parametrize("order", [list(_GATE_METRICS), list(reversed(_GATE_METRICS))])
+def test_gate_many_matches_single_symbol_gate(order):
+    """Test that batch gating scores each symbol as the single-symbol gate does."""
+    single = {
+        symbol: TSIEWOStrategy(
+            {}, fundamentals_manager=_StaticFundamentalsManager(_GATE_CONFIG, _GATE_METRICS)
+        ).check_fundamentals_gate(symbol)
+        for symbol in _GATE_METRICS
+    }
+    
+    strategy = TSIEWOStrategy(
+        {}, fundamentals_manager=_StaticFundamentalsManager(_GATE_CONFIG, _GATE_METRICS)
+    )
+    strategy.check_fundamentals_gate(order[0])
+    batch = strategy.check_fundamentals_gate_many(order)
+    
+    # Alone, even the smallest cap sits at the 100th percentile
+    assert single["HK.00002"] == (True, "fundamentals_passed")
+    assert batch == single
+
+
+class _RecordingClient:
+    """Stand-in for FutuClient that counts connect() calls."""
+    
+    def __init__(self):
+        self.connects = 0
+    
+    def connect(self):
+        self.connects += 1
+
+
+def test_fetch_fresh_data_defaults_to_sequential():
+    """Test that by default symbols are fetched in order on the calling thread."""
+    client = _RecordingClient()
+    manager = FundamentalsManager({"enabled": True}, futu_client=client)
+    
+    fetched = []
+    
+    def fetch(symbol):
+        fetched.append((symbol, threading.get_ident()))
+        return {"market_cap": float(symbol.split(".")[1])}
+    
+    manager._fetch_symbol_metrics = fetch
+    symbols = [f"HK.{i:05d}" for i in range(5)]
+    
+    data = manager._fetch_fresh_data(symbols)
+    
+    assert manager.fetch_workers == 1
+    assert fetched == [(symbol, threading.get_ident()) for symbol in symbols]
+    assert list(data) == symbols
+    assert [m["market_cap"] for m in data.values()] == list(range(5))
+    # The provider connects lazily; nothing is connected up front
+    assert client.connects == 0
+
+
+def test_fetch_fresh_data_concurrent():
+    """Test the threaded fetch: client connected once up front, results in symbol order."""
+    client = _RecordingClient()
+    manager = FundamentalsManager({"enabled": True, "fetch_workers": 4}, futu_client=client)
+    
+    def fetch(symbol):
+        # Every worker must see an already connected client
+        assert client.connects == 1
+        return {"market_cap": float(symbol.split(".")[1])}
+    
+    manager._fetch_symbol_metrics = fetch
+    symbols = [f"HK.{i:05d}" for i in range(20)]
+    
+    data = manager._fetch_fresh_data(symbols)
+    
+    assert list(data) == symbols
+    assert [m["market_cap"] for m in data.values()] == list(range(20))
+    assert client.connects == 1
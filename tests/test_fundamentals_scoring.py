@@ -1,214 +1,164 @@
 import pytest
+import numpy as np
 from src.fundamentals.scoring import FundamentalsScorer
 
 
-def get_test_config(overrides=None):
-    """Get a standard test config with optional overrides."""
-    config = {
-        "enabled": True,
-        "thresholds": {
-            "liquidity": {
-                "min": 50_000_000
+_BASE_CONFIG = {
+    "enabled": True,
+    "thresholds": {
+        "liquidity": {
+            "min": 50_000_000
+        },
+        "global": {
+            "pe_min": 0,
+            "pe_max": 60,
+            "pb_max": 10,
+            "cap_percentile_min": 0.5
+        },
+        "overrides": {
+            "US": {
+                "pe_max": 50,
+                "pb_max": 12,
+                "cap_percentile_min": 0.6
             },
-            "global": {
-                "pe_min": 0,
-                "pe_max": 60,
-                "pb_max": 10,
+            "CN": {
+                "pe_max": 80,
+                "pb_max": 12,
                 "cap_percentile_min": 0.5
-            },
-            "overrides": {
-                "US": {
-                    "pe_max": 50,
-                    "pb_max": 12,
-                    "cap_percentile_min": 0.6
-                },
-                "CN": {
-                    "pe_max": 80,
-                    "pb_max": 12,
-                    "cap_percentile_min": 0.5
-                }
             }
+        }
+    },
+    "scoring": {
+        "weights": {
+            "size": 0.4,
+            "pe": 0.3,
+            "pb": 0.3
         },
-        "scoring": {
-            "weights": {
-                "size": 0.4,
-                "pe": 0.3,
-                "pb": 0.3
-            },
-            "min_score": 0.5
-        },
-        "gate_behavior_on_missing": "pass"
-    }
-    
+        "min_score": 0.5
+    },
+    "gate_behavior_on_missing": "pass"
+}
+
+_OLD_BASE_CONFIG = {
+    "enabled": True,
+    "liquidity": {
+        "min_turnover_amount": 50_000_000
+    },
+    "valuation": {
+        "pe_min": 0,
+        "pe_max": 60,
+        "pb_max": 10
+    },
+    "size": {
+        "min_percentile": 0.5
+    },
+    "scoring": {
+        "size_weight": 0.4,
+        "pe_weight": 0.3,
+        "pb_weight": 0.3,
+        "min_score": 0.5
+    },
+    "missing_data_action": "pass"
+}
+
+
+def get_test_config(overrides=None):
+    """
+    Get the standard test config with optional top-level overrides.
+    Without overrides the shared config is returned; it must not be mutated.
+    """
     if overrides:
-        config.update(overrides)
+        return {**_BASE_CONFIG, **overrides}
     
-    return config
+    return _BASE_CONFIG
 
 
-def test_liquidity_gate_pass():
-    """Test liquidity gate with sufficient turnover."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {
-        "pe": 20,
-        "pb": 3,
-        "market_cap": 100_000_000_000,
-        "turnover_20d_avg": 100_000_000
-    }
-    
-    passes, reason, score = scorer.passes_fundamentals_gate(
-        "HK.00700",
-        metrics,
-        market="HK",
-        all_market_caps=[50_000_000_000, 100_000_000_000, 150_000_000_000]
-    )
-    
-    assert passes == True
-    assert "passed" in reason.lower()
-    assert score > 0
+def _new_config(missing_action="pass"):
+    """Current config schema (thresholds/scoring.weights)."""
+    if missing_action != "pass":
+        return get_test_config({"gate_behavior_on_missing": missing_action})
+    return _BASE_CONFIG
 
 
-def test_liquidity_gate_fail():
-    """Test liquidity gate with insufficient turnover."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {
-        "pe": 20,
-        "pb": 3,
-        "market_cap": 100_000_000_000,
-        "turnover_20d_avg": 10_000_000
-    }
-    
-    passes, reason, score = scorer.passes_fundamentals_gate(
-        "HK.00700",
-        metrics,
-        market="HK"
-    )
-    
-    assert passes == False
-    assert "liquidity" in reason.lower()
+def _old_config(missing_action="pass"):
+    """Legacy config schema (liquidity/valuation/size), kept for backward compatibility."""
+    if missing_action != "pass":
+        return {**_OLD_BASE_CONFIG, "missing_data_action": missing_action}
+    return _OLD_BASE_CONFIG
 
 
-def test_valuation_gate_pe_out_of_range():
-    """Test valuation gate with PE out of range."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {
-        "pe": 80,
-        "pb": 3,
-        "market_cap": 100_000_000_000,
-        "turnover_20d_avg": 100_000_000
-    }
-    
-    passes, reason, score = scorer.passes_fundamentals_gate(
-        "HK.00700",
-        metrics,
-        market="HK"
-    )
-    
-    assert passes == False
-    assert "pe" in reason.lower()
+# Tests that hold for both schemas run once per schema; the legacy-schema runs
+# can be skipped with -m "not duplicate_legacy"
+both_schemas = pytest.mark.parametrize(
+    "config_factory",
+    [
+        pytest.param(_new_config, id="new"),
+        pytest.param(_old_config, id="old", marks=pytest.mark.duplicate_legacy),
+    ]
+)
 
 
-def test_valuation_gate_pb_too_high():
-    """Test valuation gate with PB too high."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {
-        "pe": 20,
-        "pb": 15,
-        "market_cap": 100_000_000_000,
-        "turnover_20d_avg": 100_000_000
-    }
-    
-    passes, reason, score = scorer.passes_fundamentals_gate(
-        "HK.00700",
-        metrics,
-        market="HK"
-    )
-    
-    assert passes == False
-    assert "pb" in reason.lower()
+# Watchlist market caps shared across tests
+_CAPS = np.array([50_000_000_000, 100_000_000_000, 150_000_000_000])
+_CAPS_ONE = np.array([100_000_000_000])
+_CAPS_20 = np.arange(1, 21) * 10_000_000_000  # 10B to 200B
 
 
-def test_size_gate_market_cap_too_small():
-    """Test size gate with market cap below percentile."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {
-        "pe": 20,
-        "pb": 3,
-        "market_cap": 10_000_000_000,
-        "turnover_20d_avg": 100_000_000
+def _metrics(pe=20, pb=3, market_cap=100_000_000_000, turnover=100_000_000):
+    """Build a metrics dict; the defaults pass every gate."""
+    return {
+        "pe": pe,
+        "pb": pb,
+        "market_cap": market_cap,
+        "turnover_20d_avg": turnover
     }
-    
-    passes, reason, score = scorer.passes_fundamentals_gate(
-        "HK.00700",
-        metrics,
-        market="HK",
-        all_market_caps=[100_000_000_000, 200_000_000_000, 300_000_000_000]
-    )
-    
-    assert passes == False
-    assert "percentile" in reason.lower()
 
 
-def test_missing_data_pass_mode():
-    """Test missing data with pass mode."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {
-        "pe": None,
-        "pb": None,
-        "market_cap": 100_000_000_000,
-        "turnover_20d_avg": 100_000_000
-    }
-    
+# (metrics, all_market_caps, missing_action, expected_pass, reason keyword)
+GATE_CASES = [
+    pytest.param(_metrics(), _CAPS, "pass", True, "passed", id="liquidity_pass"),
+    pytest.param(_metrics(turnover=10_000_000), None, "pass", False, "liquidity", id="liquidity_fail"),
+    pytest.param(_metrics(pe=80), None, "pass", False, "pe", id="pe_out_of_range"),
+    pytest.param(_metrics(pb=15), None, "pass", False, "pb", id="pb_too_high"),
+    pytest.param(
+        _metrics(market_cap=10_000_000_000),
+        [100_000_000_000, 200_000_000_000, 300_000_000_000],
+        "pass", False, "percentile",
+        id="market_cap_too_small"
+    ),
+    pytest.param(_metrics(pe=None, pb=None), _CAPS, "pass", True, "passed", id="missing_data_pass_mode"),
+    pytest.param(_metrics(pe=None), None, "block", False, "missing", id="missing_data_block_mode"),
+]
+
+
+def _assert_gate(scorer, metrics, expected_pass, keyword, all_caps=None):
+    """Run the gate for one HK symbol and check the outcome and reason."""
     passes, reason, score = scorer.passes_fundamentals_gate(
         "HK.00700",
         metrics,
         market="HK",
-        all_market_caps=[50_000_000_000, 100_000_000_000, 150_000_000_000]
+        all_market_caps=all_caps
     )
     
-    assert passes == True
+    assert passes == expected_pass
+    assert keyword in reason.lower()
+    if expected_pass:
+        assert score > 0
 
 
-def test_missing_data_block_mode():
-    """Test missing data with block mode."""
-    config = get_test_config({
-        "gate_behavior_on_missing": "block"
-    })
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {
-        "pe": None,
-        "pb": 3,
-        "market_cap": 100_000_000_000,
-        "turnover_20d_avg": 100_000_000
-    }
+@both_schemas
+@pytest.mark.parametrize("metrics, all_caps, missing_action, expected_pass, keyword", GATE_CASES)
+def test_gate(config_factory, scorer_factory, metrics, all_caps, missing_action, expected_pass, keyword):
+    """Test the liquidity, valuation, size and missing-data gates."""
+    scorer = scorer_factory(config_factory(missing_action=missing_action))
     
-    passes, reason, score = scorer.passes_fundamentals_gate(
-        "HK.00700",
-        metrics,
-        market="HK"
-    )
-    
-    assert passes == False
-    assert "missing" in reason.lower()
+    _assert_gate(scorer, metrics, expected_pass, keyword, all_caps=all_caps)
 
 
-def test_market_specific_overrides():
+def test_market_specific_overrides(scorer_factory):
     """Test market-specific valuation overrides."""
     config = get_test_config()
-    scorer = FundamentalsScorer(config)
+    scorer = scorer_factory(config)
     
     metrics = {
         "pe": 55,
@@ -222,7 +172,7 @@ def test_market_specific_overrides():
         "CN.600000",
         metrics,
         market="CN",
-        all_market_caps=[100_000_000_000]
+        all_market_caps=_CAPS_ONE
     )
     
     # Should fail in US (pe_max=50)
@@ -230,7 +180,7 @@ def test_market_specific_overrides():
         "US.AAPL",
         metrics,
         market="US",
-        all_market_caps=[100_000_000_000]
+        all_market_caps=_CAPS_ONE
     )
     
     # Should pass in HK (pe_max=60 from global)
@@ -238,7 +188,7 @@ def test_market_specific_overrides():
         "HK.00700",
         metrics,
         market="HK",
-        all_market_caps=[100_000_000_000]
+        all_market_caps=_CAPS_ONE
     )
     
     assert passes_cn == True
@@ -246,10 +196,10 @@ def test_market_specific_overrides():
     assert passes_hk == True
 
 
-def test_market_specific_cap_percentile():
+def test_market_specific_cap_percentile(scorer_factory):
     """Test market-specific cap percentile thresholds."""
     config = get_test_config()
-    scorer = FundamentalsScorer(config)
+    scorer = scorer_factory(config)
     
     # Test with a market cap at 55th percentile
     metrics = {
@@ -259,7 +209,7 @@ def test_market_specific_cap_percentile():
         "turnover_20d_avg": 100_000_000
     }
     
-    all_caps = [i * 10_000_000_000 for i in range(1, 21)]  # 10B to 200B
+    all_caps = _CAPS_20
     
     # Should pass in HK (min=0.5)
     passes_hk, _, _ = scorer.passes_fundamentals_gate(
@@ -281,20 +231,25 @@ def test_market_specific_cap_percentile():
     assert passes_us == False
 
 
-def test_fundamentals_disabled():
+@pytest.fixture(scope="module")
+def disabled_scorer(scorer_factory):
+    """Scorer with fundamentals disabled, shared by the module."""
+    return scorer_factory({"enabled": False})
+
+
+@pytest.mark.parametrize(
+    "metrics, market",
+    [
+        pytest.param({}, "HK", id="no_metrics"),
+        pytest.param(_metrics(pe=80, turnover=10_000_000), "US", id="failing_metrics"),
+    ]
+)
+def test_fundamentals_disabled(disabled_scorer, metrics, market):
     """Test with fundamentals disabled."""
-    config = {
-        "enabled": False,
-    }
-    
-    scorer = FundamentalsScorer(config)
-    
-    metrics = {}
-    
-    passes, reason, score = scorer.passes_fundamentals_gate(
+    passes, reason, score = disabled_scorer.passes_fundamentals_gate(
         "HK.00700",
         metrics,
-        market="HK"
+        market=market
     )
     
     assert passes == True
@@ -302,10 +257,11 @@ def test_fundamentals_disabled():
     assert score == 1.0
 
 
-def test_composite_score_calculation():
+@both_schemas
+def test_composite_score_calculation(config_factory, scorer_factory):
     """Test composite score calculation with new formula."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
+    config = config_factory()
+    scorer = scorer_factory(config)
     
     metrics = {
         "pe": 30,  # PE_Score = (60-30)/60 = 0.5
@@ -314,7 +270,7 @@ def test_composite_score_calculation():
         "turnover_20d_avg": 100_000_000
     }
     
-    all_caps = [50_000_000_000, 100_000_000_000, 150_000_000_000]
+    all_caps = _CAPS
     
     passes, reason, score = scorer.passes_fundamentals_gate(
         "HK.00700",
@@ -328,10 +284,11 @@ def test_composite_score_calculation():
     assert score > 0.5
 
 
-def test_composite_score_too_low():
+@both_schemas
+def test_composite_score_too_low(config_factory, scorer_factory):
     """Test failing composite score threshold."""
-    config = get_test_config()
-    scorer = FundamentalsScorer(config)
+    config = config_factory()
+    scorer = scorer_factory(config)
     
     metrics = {
         "pe": 58,  # PE_Score = (60-58)/60 = 0.033
@@ -355,31 +312,13 @@ def test_composite_score_too_low():
     assert score < 0.5
 
 
-def test_backward_compatibility_old_config():
-    """Test that old config format still works."""
-    old_config = {
-        "enabled": True,
-        "liquidity": {
-            "min_turnover_amount": 50_000_000
-        },
-        "valuation": {
-            "pe_min": 0,
-            "pe_max": 60,
-            "pb_max": 10
-        },
-        "size": {
-            "min_percentile": 0.5
-        },
-        "scoring": {
-            "size_weight": 0.4,
-            "pe_weight": 0.3,
-            "pb_weight": 0.3,
-            "min_score": 0.5
-        },
-        "missing_data_action": "pass"
-    }
-    
-    scorer = FundamentalsScorer(old_config)
+@both_schemas
+def test_scorer_is_stateless(config_factory):
+    """Test that scoring leaves the scorer and its config unchanged, so scorers can be shared."""
+    config = config_factory()
+    snapshot = repr(config)
+    scorer = FundamentalsScorer(config)
+    state = dict(vars(scorer))
     
     metrics = {
         "pe": 20,
@@ -387,13 +326,12 @@ def test_backward_compatibility_old_config():
         "market_cap": 100_000_000_000,
         "turnover_20d_avg": 100_000_000
     }
+    all_caps = _CAPS
     
-    passes, reason, score = scorer.passes_fundamentals_gate(
-        "HK.00700",
-        metrics,
-        market="HK",
-        all_market_caps=[50_000_000_000, 100_000_000_000, 150_000_000_000]
-    )
+    first = scorer.passes_fundamentals_gate("HK.00700", metrics, market="HK", all_market_caps=all_caps)
+    scorer.passes_fundamentals_gate("HK.00700", {"pe": 80}, market="HK")
+    second = scorer.passes_fundamentals_gate("HK.00700", metrics, market="HK", all_market_caps=all_caps)
     
-    assert passes == True
-    assert score > 0
+    assert first == second
+    assert vars(scorer) == state
+    assert repr(config) == snapshot
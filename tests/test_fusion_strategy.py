@@ -1,36 +1,11 @@
 import pytest
 import pandas as pd
 import numpy as np
+from src.strategies import fusion
+from src.strategies.base import NUMEXPR_MIN_ROWS
 from src.strategies.fusion import FusionStrategy
 
 
-def create_sample_data():
-    """Create sample data with indicators."""
-    dates = pd.date_range("2024-01-01", periods=50, freq="1h")
-    
-    df = pd.DataFrame({
-        "open": 100 + np.random.randn(50).cumsum() * 0.5,
-        "high": 102 + np.random.randn(50).cumsum() * 0.5,
-        "low": 98 + np.random.randn(50).cumsum() * 0.5,
-        "close": 100 + np.random.randn(50).cumsum() * 0.5,
-        "volume": np.random.randint(1000, 10000, 50),
-        # Indicator columns
-        "ST_trend": [1] * 25 + [-1] * 25,
-        "ST_flip_up": [False] * 24 + [True] + [False] * 25,
-        "ST_flip_down": [False] * 25 + [True] + [False] * 24,
-        "HMA_slope": np.linspace(0.1, -0.1, 50),
-        "HMA_slope_pct": np.linspace(0.1, -0.1, 50),
-        "RSI": np.linspace(60, 40, 50),
-        "QQE_long": [True] * 25 + [False] * 25,
-        "QQE_short": [False] * 25 + [True] * 25,
-        "ADX": np.linspace(30, 20, 50),
-        "ADX_strong": [True] * 30 + [False] * 20,
-        "ATR_accept": [True] * 50
-    }, index=dates)
-    
-    return df
-
-
 def test_fusion_strategy_init():
     """Test FusionStrategy initialization."""
     config = {
@@ -45,7 +20,24 @@ def test_fusion_strategy_init():
     assert strategy.fusion_mode == "rule_based"
 
 
-def test_template_supertrend_hma():
+def test_no_rules_configured(sample_df):
+    """Test that a strategy without rules emits no signals."""
+    config = {
+        "fusion_mode": "rule_based",
+        "entry_rules": {},
+        "exit_rules": {},
+        "filters": {"min_volume": 5000}
+    }
+    
+    strategy = FusionStrategy(config)
+    df_signals = strategy.generate_signals(sample_df)
+    
+    for col in ["long_entry", "long_exit", "short_entry", "short_exit"]:
+        assert col in df_signals.columns
+        assert not df_signals[col].any()
+
+
+def test_template_supertrend_hma(sample_df):
     """Test supertrend_hma template."""
     config = {
         "fusion_mode": "rule_based",
@@ -59,7 +51,7 @@ def test_template_supertrend_hma():
     }
     
     strategy = FusionStrategy(config)
-    df = create_sample_data()
+    df = sample_df
     
     df_signals = strategy.generate_signals(df)
     
@@ -67,13 +59,16 @@ def test_template_supertrend_hma():
     assert "long_entry" in df_signals.columns
     assert "long_exit" in df_signals.columns
     
+    # Input frame is left untouched
+    assert "long_entry" not in df.columns
+    
     # Check some signals are generated
     # First part should have long entries (ST_trend=1, HMA_slope>0, RSI>50)
     first_quarter = df_signals.iloc[:12]
     assert first_quarter["long_entry"].any()
 
 
-def test_template_supertrend_qqe():
+def test_template_supertrend_qqe(sample_df):
     """Test supertrend_qqe template."""
     config = {
         "fusion_mode": "rule_based",
@@ -87,7 +82,7 @@ def test_template_supertrend_qqe():
     }
     
     strategy = FusionStrategy(config)
-    df = create_sample_data()
+    df = sample_df
     
     df_signals = strategy.generate_signals(df)
     
@@ -96,7 +91,7 @@ def test_template_supertrend_qqe():
     assert "long_exit" in df_signals.columns
 
 
-def test_custom_rule_evaluation():
+def test_custom_rule_evaluation(sample_df):
     """Test custom rule evaluation."""
     config = {
         "fusion_mode": "rule_based",
@@ -126,20 +121,20 @@ def test_custom_rule_evaluation():
     }
     
     strategy = FusionStrategy(config)
-    df = create_sample_data()
+    df = sample_df
     
     df_signals = strategy.generate_signals(df)
     
+    long_entry = df_signals["long_entry"].to_numpy()
+    
     # First rows should have long entries (ST_trend=1 and RSI>50)
-    first_rows = df_signals.iloc[:10]
-    assert first_rows["long_entry"].any()
+    assert long_entry[:10].any()
     
     # Last rows should not (ST_trend=-1)
-    last_rows = df_signals.iloc[-10:]
-    assert not last_rows["long_entry"].any()
+    assert not long_entry[-10:].any()
 
 
-def test_or_rule():
+def test_or_rule(sample_df):
     """Test OR rule evaluation."""
     config = {
         "fusion_mode": "rule_based",
@@ -169,7 +164,7 @@ def test_or_rule():
     }
     
     strategy = FusionStrategy(config)
-    df = create_sample_data()
+    df = sample_df
     
     df_signals = strategy.generate_signals(df)
     
@@ -177,7 +172,71 @@ def test_or_rule():
     assert df_signals["long_entry"].any()
 
 
-def test_filters():
+def test_rule_missing_column_and_nan(sample_df):
+    """Test that missing columns and NaN values never trigger a condition."""
+    config = {
+        "fusion_mode": "rule_based",
+        "entry_rules": {
+            "long_entry": {
+                "rule": {
+                    "type": "condition",
+                    "indicator": "RSI",
+                    "operator": "!=",
+                    "value": 0
+                }
+            },
+            "short_entry": {
+                "rule": {
+                    "type": "condition",
+                    "indicator": "NOT_A_COLUMN",
+                    "operator": "==",
+                    "value": 1
+                }
+            }
+        },
+        "exit_rules": {},
+        "min_confidence": 0.3
+    }
+    
+    strategy = FusionStrategy(config)
+    df = sample_df.copy()
+    df.loc[df.index[:5], "RSI"] = np.nan
+    
+    df_signals = strategy.generate_signals(df)
+    
+    assert not df_signals["long_entry"].iloc[:5].any()
+    assert df_signals["long_entry"].iloc[5:].all()
+    assert not df_signals["short_entry"].any()
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_rule_type_mismatch(sample_df, engine):
+    """Test that comparing a column with a value of another type follows Python semantics."""
+    def cond(indicator, operator_name, value):
+        return {"rule": {"type": "condition", "indicator": indicator, "operator": operator_name, "value": value}}
+    
+    config = {
+        "fusion_mode": "rule_based",
+        "entry_rules": {
+            "long_entry": cond("ST_trend", "==", "1"),
+            "short_entry": cond("ST_trend", "!=", "1")
+        },
+        "exit_rules": {
+            "long_exit": cond("QQE_long", "!=", "x")
+        },
+        "engine": engine
+    }
+    
+    df = pd.concat([sample_df] * 120, ignore_index=True)
+    df_signals = FusionStrategy(config).generate_signals(df)
+    
+    # 1 == "1" is False and 1 != "1" is True, as with the old per-row evaluation
+    assert not df_signals["long_entry"].any()
+    assert df_signals["short_entry"].all()
+    assert df_signals["long_exit"].all()
+
+
+def test_filters(sample_df):
     """Test signal filters."""
     config = {
         "fusion_mode": "rule_based",
@@ -194,19 +253,17 @@ def test_filters():
     }
     
     strategy = FusionStrategy(config)
-    df = create_sample_data()
+    df = sample_df.copy()
     
-    # Set some rows to fail filters
-    df.loc[df.index[0], "volume"] = 1000  # Below min_volume
-    df.loc[df.index[1], "ATR_accept"] = False
-    df.loc[df.index[2], "ADX_strong"] = False
+    # Set some rows to fail filters (positional writes, no label lookup)
+    df.iloc[0, df.columns.get_loc("volume")] = 1000  # Below min_volume
+    df.iloc[1, df.columns.get_loc("ATR_accept")] = False
+    df.iloc[2, df.columns.get_loc("ADX_strong")] = False
     
     df_signals = strategy.generate_signals(df)
     
     # These rows should not have signals
-    assert not df_signals.loc[df.index[0], "long_entry"]
-    assert not df_signals.loc[df.index[1], "long_entry"]
-    assert not df_signals.loc[df.index[2], "long_entry"]
+    assert not df_signals["long_entry"].to_numpy()[:3].any()
 
 
 def test_calculate_confidence():
@@ -219,20 +276,39 @@ def test_calculate_confidence():
     
     strategy = FusionStrategy(config)
     
-    # Create a row with strong signals
-    row = pd.Series({
+    # Create a row with strong signals, as the plain dict extract_latest_signals passes
+    row = {
         "ST_trend": 1,
         "HMA_slope": 0.5,
-        "RSI": 65,
-        "ADX": 35,
+        "RSI": 65.0,
+        "ADX": 35.0,
         "QQE_long": True
-    })
+    }
     
     confidence = strategy.calculate_confidence(row)
     assert 0 <= confidence <= 1
     assert confidence > 0.5  # Should be high with all positive indicators
 
 
+def test_calculate_confidence_partial_row():
+    """Test that confidence is rescaled when only some components exist."""
+    config = {
+        "fusion_mode": "rule_based",
+        "entry_rules": {},
+        "exit_rules": {}
+    }
+    
+    strategy = FusionStrategy(config)
+    
+    # Only RSI available: 0.5 deviation * 0.2 weight, scaled by 5/1
+    assert strategy.calculate_confidence({"RSI": 75}) == pytest.approx(0.5)
+    # NaN components are ignored
+    assert strategy.calculate_confidence({"RSI": 75, "ADX": np.nan}) == pytest.approx(0.5)
+    # So are nullable-dtype missing values
+    assert strategy.calculate_confidence({"RSI": 75, "ADX": pd.NA}) == pytest.approx(0.5)
+    assert strategy.calculate_confidence({}) == 0.0
+
+
 def test_get_signal_reason():
     """Test signal reason generation."""
     config = {
@@ -243,15 +319,15 @@ def test_get_signal_reason():
     
     strategy = FusionStrategy(config)
     
-    row = pd.Series({
+    row = {
         "ST_trend": 1,
         "HMA_slope": 0.5,
         "HMA_slope_pct": 0.2,
-        "RSI": 65,
-        "ADX": 35,
+        "RSI": 65.0,
+        "ADX": 35.0,
         "ADX_strong": True,
         "QQE_long": True
-    })
+    }
     
     reason = strategy.get_signal_reason(row, "LONG")
     assert isinstance(reason, str)
@@ -260,7 +336,27 @@ def test_get_signal_reason():
     assert any(x in reason for x in ["ST", "HMA", "RSI", "QQE", "ADX"])
 
 
-def test_extract_latest_signals():
+@pytest.fixture(scope="module")
+def signals_df(sample_df):
+    """Sample frame with supertrend_hma long-entry signals, shared by the module."""
+    strategy = FusionStrategy({
+        "fusion_mode": "rule_based",
+        "entry_rules": {
+            "long_entry": {"template": "supertrend_hma"}
+        },
+        "exit_rules": {}
+    })
+    return strategy.generate_signals(sample_df)
+
+
+def _with_last_long_entry(df_signals):
+    """Copy of df_signals with a long entry forced on the last row."""
+    df_signals = df_signals.copy()
+    df_signals.iloc[-1, df_signals.columns.get_loc("long_entry")] = True
+    return df_signals
+
+
+def test_extract_latest_signals(signals_df):
     """Test extracting latest signals."""
     config = {
         "fusion_mode": "rule_based",
@@ -272,12 +368,9 @@ def test_extract_latest_signals():
     }
     
     strategy = FusionStrategy(config)
-    df = create_sample_data()
-    
-    df_signals = strategy.generate_signals(df)
     
     # Force a signal in the last row
-    df_signals.loc[df_signals.index[-1], "long_entry"] = True
+    df_signals = _with_last_long_entry(signals_df)
     
     signals = strategy.extract_latest_signals(
         df_signals,
@@ -308,7 +401,7 @@ def test_empty_dataframe():
     assert signals == []
 
 
-def test_no_signals():
+def test_no_signals(signals_df):
     """Test when no signals meet confidence threshold."""
     config = {
         "fusion_mode": "rule_based",
@@ -320,10 +413,220 @@ def test_no_signals():
     }
     
     strategy = FusionStrategy(config)
-    df = create_sample_data()
-    
-    df_signals = strategy.generate_signals(df)
-    df_signals.loc[df_signals.index[-1], "long_entry"] = True
+    df_signals = _with_last_long_entry(signals_df)
     
     signals = strategy.extract_latest_signals(df_signals, "TEST", "60min")
     assert len(signals) == 0  # High confidence threshold filters out signals
+
+
+def test_fundamentals_gate_is_memoized(counting_manager):
+    """Test that gate results are reused until refresh_fundamentals()."""
+    manager = counting_manager(failing={"HK.00001"})
+    strategy = FusionStrategy({"fusion_mode": "rule_based"}, fundamentals_manager=manager)
+    
+    assert strategy.check_fundamentals_gate("HK.00700") == (True, "fundamentals_passed")
+    assert strategy.check_fundamentals_gate("HK.00700") == (True, "fundamentals_passed")
+    passes, reason = strategy.check_fundamentals_gate("HK.00001")
+    assert not passes
+    assert "pe_out_of_range" in reason
+    assert manager.calls == 2
+    
+    strategy.refresh_fundamentals()
+    strategy.check_fundamentals_gate("HK.00700")
+    assert manager.calls == 3
+
+
+def test_signal_dtype(sample_df):
+    """Test that signal columns can be stored with an extension dtype."""
+    config = {
+        "fusion_mode": "rule_based",
+        "entry_rules": {
+            "long_entry": {"template": "supertrend_hma"}
+        },
+        "exit_rules": {},
+        "signal_dtype": "boolean"
+    }
+    
+    strategy = FusionStrategy(config)
+    df_signals = strategy.generate_signals(sample_df)
+    
+    assert df_signals["long_entry"].dtype == "boolean"
+    assert df_signals["long_entry"].any()
+    assert not df_signals["short_entry"].any()
+
+
+@pytest.mark.parametrize("signal_dtype", ["float64", "not_a_dtype"])
+def test_signal_dtype_validated(signal_dtype):
+    """Test that an unusable signal dtype is rejected at construction."""
+    with pytest.raises(ValueError, match="signal_dtype"):
+        FusionStrategy({"signal_dtype": signal_dtype})
+
+
+def test_signal_dtype_pyarrow():
+    """Test that "bool[pyarrow]" is rejected without pyarrow and accepted with it."""
+    try:
+        import pyarrow
+    except ImportError:
+        with pytest.raises(ValueError, match="pyarrow"):
+            FusionStrategy({"signal_dtype": "bool[pyarrow]"})
+    else:
+        assert FusionStrategy({"signal_dtype": "bool[pyarrow]"}).signal_dtype == "bool[pyarrow]"
+
+
+def test_extract_latest_signals_batch(sample_df, counting_manager):
+    """Test that batch extraction matches per-symbol extraction."""
+    config = {
+        "fusion_mode": "rule_based",
+        "entry_rules": {
+            "long_entry": {"template": "supertrend_hma"}
+        },
+        "exit_rules": {},
+        "min_confidence": 0.3
+    }
+    
+    manager = counting_manager(failing={"HK.00001"})
+    strategy = FusionStrategy(config, fundamentals_manager=manager)
+    df_signals = strategy.generate_signals(sample_df)
+    
+    df_long = df_signals.copy()
+    df_long.loc[df_long.index[-1], "long_entry"] = True
+    
+    dfs = {
+        "HK.00700": df_long,
+        "HK.00001": df_long,
+        "HK.09988": df_signals,
+        "HK.00941": pd.DataFrame(),
+    }
+    
+    batch = strategy.extract_latest_signals_batch(dfs, "60min")
+    
+    # One gate check per non-empty frame, memoized for the next pass
+    assert manager.calls == 3
+    strategy.extract_latest_signals_batch(dfs, "60min")
+    assert manager.calls == 3
+    assert [(s["symbol"], s["side"]) for s in batch] == [
+        ("HK.00700", "LONG"),
+        ("HK.00001", "SUPPRESSED"),
+    ]
+    
+    single = strategy.extract_latest_signals(df_long, "HK.00700", "60min")
+    assert batch[0] == single[0]
+
+
+class _FixedConfidenceStrategy(FusionStrategy):
+    """Subclass customizing confidence, as INDICATOR_GUIDE.md describes."""
+    
+    def calculate_confidence(self, row):
+        return 0.9
+
+
+def test_batch_uses_overridden_confidence(sample_df):
+    """Test that batch extraction honours a subclass's calculate_confidence."""
+    strategy = _FixedConfidenceStrategy({
+        "fusion_mode": "rule_based",
+        "entry_rules": {"long_entry": {"template": "supertrend_hma"}},
+        "min_confidence": 0.8
+    })
+    df_long = _with_last_long_entry(strategy.generate_signals(sample_df))
+    
+    single = strategy.extract_latest_signals(df_long, "HK.00700", "60min")
+    batch = strategy.extract_latest_signals_batch({"HK.00700": df_long}, "60min")
+    
+    assert [s["confidence"] for s in single] == [0.9]
+    assert batch == single
+
+
+def test_confidence_batch_matches_scalar():
+    """Test that batch confidence scoring matches the per-row score."""
+    strategy = FusionStrategy({"fusion_mode": "rule_based"})
+    
+    rows = [
+        {"ST_trend": 1, "HMA_slope": 0.05, "RSI": 65, "ADX": 35, "QQE_long": True, "QQE_short": False},
+        {"ST_trend": 0, "HMA_slope": -0.3, "RSI": np.nan, "ADX": 60, "QQE_long": False, "QQE_short": False},
+        {"ST_trend": -1, "RSI": 20},
+        {"HMA_slope": np.nan},
+        # A NaN QQE flag is present and truthy, unlike a missing QQE column
+        {"ST_trend": 1.0, "RSI": 60.0, "QQE_long": np.nan},
+    ]
+    
+    batch = strategy._confidence_batch(rows)
+    expected = [strategy.calculate_confidence(row) for row in rows]
+    
+    np.testing.assert_allclose(batch, expected)
+
+
+def test_weighted_fusion(sample_df):
+    """Test weighted fusion thresholds on the weighted indicator sum."""
+    config = {
+        "fusion_mode": "weighted",
+        "weights": {"ST_trend": 0.5, "RSI": 0.01, "MISSING": 1.0},
+        "threshold": 1.0
+    }
+    
+    strategy = FusionStrategy(config)
+    df = sample_df
+    
+    df_signals = strategy.generate_signals(df)
+    
+    strength = df["ST_trend"] * 0.5 + df["RSI"] * 0.01
+    assert (df_signals["long_entry"] == (strength > 1.0)).all()
+    assert (df_signals["short_entry"] == (strength < -1.0)).all()
+    assert (df_signals["long_exit"] == (strength < -0.5)).all()
+    assert (df_signals["short_exit"] == (strength > 0.5)).all()
+
+
+def test_polars_engine_matches_pandas(sample_df):
+    """Test that the polars engine produces the same signals as pandas."""
+    pytest.importorskip("polars")
+    
+    df = pd.concat([sample_df] * 120, ignore_index=True)
+    df.loc[::7, "RSI"] = np.nan
+    config = {
+        "fusion_mode": "rule_based",
+        "entry_rules": {
+            "long_entry": {"template": "supertrend_hma"},
+            "short_entry": {"template": "supertrend_qqe"}
+        },
+        "exit_rules": {
+            "long_exit": {"template": "supertrend_hma"},
+            "short_exit": {"template": "unknown"}
+        },
+        "filters": {"min_volume": 0}
+    }
+    
+    pandas_signals = FusionStrategy(config).generate_signals(df)
+    polars_strategy = FusionStrategy({**config, "engine": "polars"})
+    assert polars_strategy._polars_signals(df) is not None
+    polars_signals = polars_strategy.generate_signals(df)
+    
+    for side in ["long_entry", "long_exit", "short_entry", "short_exit"]:
+        assert (polars_signals[side] == pandas_signals[side]).all()
+
+
+@pytest.mark.parametrize("config", [
+    {
+        "fusion_mode": "rule_based",
+        "entry_rules": {"long_entry": {"template": "supertrend_hma"}},
+        "filters": {"use_adx_filter": True, "min_volume": np.int64(5000)}
+    },
+    {
+        "fusion_mode": "weighted",
+        "weights": {"ST_trend": np.float64(0.5), "RSI": 0.01, "ADX": float("inf")},
+        "threshold": 1.0,
+        "filters": {"min_volume": 5000.0}
+    },
+], ids=["numpy_min_volume", "nonfinite_weight"])
+def test_numexpr_matches_numpy(sample_df, monkeypatch, config):
+    """Test that the numexpr path on long frames accepts NumPy and non-finite parameters."""
+    pytest.importorskip("numexpr")
+    
+    df = pd.concat([sample_df] * (NUMEXPR_MIN_ROWS // len(sample_df) + 1), ignore_index=True)
+    strategy = FusionStrategy(config)
+    
+    fused = strategy.generate_signals(df)
+    monkeypatch.setattr(fusion, "ne", None)
+    plain = strategy.generate_signals(df)
+    
+    for side in ["long_entry", "long_exit", "short_entry", "short_exit"]:
+        assert (fused[side] == plain[side]).all()
+    assert fused["long_entry"].any()
@@ -1,6 +1,5 @@
 import pytest
 import pandas as pd
-import numpy as np
 from src.indicators.registry import (
     BaseIndicator,
     IndicatorRegistry,
@@ -9,6 +8,20 @@ from src.indicators.registry import (
 )
 
 
+@pytest.fixture(scope="module")
+def indicators():
+    """
+    Indicator instances shared by the module.
+    Only constructor parameters are stored on them, so they are safe to reuse.
+    """
+    registry = get_registry()
+    return {
+        "st": registry.create("supertrend", atr_period=10, multiplier=3.0),
+        "hma16": registry.create("hma", period=16, slope_period=3),
+        "rsi14": registry.create("rsi", period=14),
+    }
+
+
 def test_registry_singleton():
     """Test that get_registry returns the same instance."""
     reg1 = get_registry()
@@ -32,12 +45,10 @@ def test_available_indicators():
     assert "ewo" in indicators
 
 
-def test_create_indicator():
+def test_create_indicator(indicators):
     """Test creating an indicator instance."""
-    registry = get_registry()
-    
-    # Create SuperTrend indicator
-    st = registry.create("supertrend", atr_period=10, multiplier=3.0)
+    # SuperTrend created with atr_period=10, multiplier=3.0
+    st = indicators["st"]
     assert st.name == "supertrend"
     assert st.params["atr_period"] == 10
     assert st.params["multiplier"] == 3.0
@@ -51,83 +62,44 @@ def test_create_unknown_indicator():
         registry.create("nonexistent_indicator")
 
 
-def test_indicator_calculate():
+@pytest.mark.parametrize(
+    "key, expected_columns",
+    [
+        pytest.param("st", ["ST_trend", "ST_signal"], id="supertrend"),
+        pytest.param("hma16", ["HMA", "HMA_slope"], id="hma"),
+        pytest.param("rsi14", ["RSI", "RSI_bullish"], id="rsi"),
+    ]
+)
+def test_indicator_calculate(ohlcv_100, indicators, key, expected_columns):
     """Test that indicators can calculate on sample data."""
-    # Create sample OHLCV data
-    dates = pd.date_range("2024-01-01", periods=100, freq="1h")
-    np.random.seed(42)
+    df_result = indicators[key].calculate(ohlcv_100)
     
-    df = pd.DataFrame({
-        "open": 100 + np.random.randn(100).cumsum(),
-        "high": 100 + np.random.randn(100).cumsum() + 1,
-        "low": 100 + np.random.randn(100).cumsum() - 1,
-        "close": 100 + np.random.randn(100).cumsum(),
-        "volume": np.random.randint(1000, 10000, 100)
-    }, index=dates)
-    
-    # Ensure high >= low
-    df["high"] = df[["open", "high", "close"]].max(axis=1)
-    df["low"] = df[["open", "low", "close"]].min(axis=1)
-    
-    registry = get_registry()
-    
-    # Test SuperTrend
-    st = registry.create("supertrend", atr_period=10, multiplier=3.0)
-    df_st = st.calculate(df)
-    assert "ST_trend" in df_st.columns
-    assert "ST_signal" in df_st.columns
-    
-    # Test HMA
-    hma = registry.create("hma", period=16, slope_period=3)
-    df_hma = hma.calculate(df)
-    assert "HMA" in df_hma.columns
-    assert "HMA_slope" in df_hma.columns
-    
-    # Test RSI
-    rsi = registry.create("rsi", period=14)
-    df_rsi = rsi.calculate(df)
-    assert "RSI" in df_rsi.columns
-    assert "RSI_bullish" in df_rsi.columns
+    for col in expected_columns:
+        assert col in df_result.columns
+
 
+INDICATOR_CONFIGS = [
+    {"name": "supertrend", "params": {"atr_period": 10, "multiplier": 3.0}},
+    {"name": "hma", "params": {"period": 16}},
+    {"name": "rsi", "params": {"period": 14}}
+]
 
-def test_calculate_all():
+
+@pytest.fixture(scope="module")
+def calc_all_out(ohlcv_100):
+    """INDICATOR_CONFIGS calculated over the shared OHLCV frame, once per module."""
+    return get_registry().calculate_all(ohlcv_100, INDICATOR_CONFIGS)
+
+
+@pytest.mark.parametrize("column", ["ST_trend", "HMA", "RSI"])
+def test_calculate_all(calc_all_out, column):
     """Test calculating multiple indicators at once."""
-    dates = pd.date_range("2024-01-01", periods=100, freq="1h")
-    np.random.seed(42)
-    
-    df = pd.DataFrame({
-        "open": 100 + np.random.randn(100).cumsum(),
-        "high": 100 + np.random.randn(100).cumsum() + 1,
-        "low": 100 + np.random.randn(100).cumsum() - 1,
-        "close": 100 + np.random.randn(100).cumsum(),
-        "volume": np.random.randint(1000, 10000, 100)
-    }, index=dates)
-    
-    df["high"] = df[["open", "high", "close"]].max(axis=1)
-    df["low"] = df[["open", "low", "close"]].min(axis=1)
-    
-    registry = get_registry()
-    
-    indicator_configs = [
-        {"name": "supertrend", "params": {"atr_period": 10, "multiplier": 3.0}},
-        {"name": "hma", "params": {"period": 16}},
-        {"name": "rsi", "params": {"period": 14}}
-    ]
-    
-    df_result = registry.calculate_all(df, indicator_configs)
-    
-    # Check all indicators are present
-    assert "ST_trend" in df_result.columns
-    assert "HMA" in df_result.columns
-    assert "RSI" in df_result.columns
+    assert column in calc_all_out.columns
 
 
-def test_get_signal_columns():
+def test_get_signal_columns(indicators):
     """Test that indicators report their output columns."""
-    registry = get_registry()
-    
-    st = registry.create("supertrend")
-    columns = st.get_signal_columns()
+    columns = indicators["st"].get_signal_columns()
     assert isinstance(columns, list)
     assert len(columns) > 0
     assert "ST_trend" in columns
@@ -5,30 +5,42 @@ from src.indicators.tsi_ewo import (
     calculate_tsi,
     calculate_ewo,
     calculate_ma,
+    add_all_indicators,
     detect_crossover,
     detect_crossunder,
-    add_all_indicators,
+    _crossover_kernel,
+    _crossover_vec,
+    _crossover_np,
 )
 
 
-def test_calculate_tsi():
+@pytest.fixture(scope="module")
+def tsi_ewo_precomp():
+    """TSI and EWO computed once over a shared random-walk price series."""
+    rng = np.random.default_rng(42)
+    prices = pd.Series(rng.standard_normal(100).cumsum() + 100)
+    
+    return {
+        "prices": prices,
+        "tsi": calculate_tsi(prices, long=25, short=13, signal=13),
+        "ewo": calculate_ewo(prices, fast=5, slow=35),
+    }
+
+
+def test_calculate_tsi(tsi_ewo_precomp):
     """Test TSI calculation."""
-    np.random.seed(42)
-    prices = pd.Series(np.random.randn(100).cumsum() + 100)
-    
-    tsi_df = calculate_tsi(prices, long=25, short=13, signal=13)
+    prices = tsi_ewo_precomp["prices"]
+    tsi_df = tsi_ewo_precomp["tsi"]
     
     assert "TSI" in tsi_df.columns
     assert len(tsi_df) == len(prices)
     assert not tsi_df["TSI"].isna().all()
 
 
-def test_calculate_ewo():
+def test_calculate_ewo(tsi_ewo_precomp):
     """Test EWO calculation."""
-    np.random.seed(42)
-    prices = pd.Series(np.random.randn(100).cumsum() + 100)
-    
-    ewo = calculate_ewo(prices, fast=5, slow=35)
+    prices = tsi_ewo_precomp["prices"]
+    ewo = tsi_ewo_precomp["ewo"]
     
     assert ewo is not None
     assert len(ewo) == len(prices)
@@ -70,42 +82,85 @@ def test_detect_crossunder():
     assert crossunders.iloc[6] == False
 
 
-def test_add_all_indicators():
-    """Test adding all indicators to a DataFrame."""
-    np.random.seed(42)
-    
-    dates = pd.date_range('2023-01-01', periods=100, freq='1h')
-    df = pd.DataFrame({
-        'open': np.random.randn(100).cumsum() + 100,
-        'high': np.random.randn(100).cumsum() + 102,
-        'low': np.random.randn(100).cumsum() + 98,
-        'close': np.random.randn(100).cumsum() + 100,
-        'volume': np.random.randint(1000, 10000, 100),
-    }, index=dates)
+def test_detect_cross_series_nan():
+    """Test that NaN breaks a run and the result keeps the input's index and name."""
+    index = pd.date_range("2024-01-01", periods=6, freq="1h")
+    series = pd.Series([1, np.nan, 1, -1, np.nan, 2], index=index, name="TSI")
     
-    df_with_indicators = add_all_indicators(df)
+    crossovers = detect_crossover(series, threshold=0)
+    crossunders = detect_crossunder(-series, threshold=0)
     
-    expected_columns = ['TSI', 'TSI_signal', 'EWO', 'MA', 
-                       'TSI_crossover', 'TSI_crossunder',
-                       'EWO_crossover', 'EWO_crossunder']
+    for crossed in (crossovers, crossunders):
+        assert crossed.dtype == bool
+        assert crossed.index.equals(index)
+        assert crossed.name == "TSI"
+        assert crossed.tolist() == [True, False, True, False, False, True]
+
+
+# Every implementation behind _crossover_np; with numba installed, that is the njit build
+CROSSOVER_IMPLS = [
+    pytest.param(_crossover_kernel, id="kernel"),
+    pytest.param(_crossover_vec, id="vec"),
+    pytest.param(_crossover_np, id="njit"),
+]
+
+
+@pytest.mark.parametrize("crossover", CROSSOVER_IMPLS)
+@pytest.mark.parametrize("values, threshold, expected", [
+    ([-2, -1, 0.5, 1, 2, 1, 0.5, -0.5, -1], 0.0, [2]),
+    ([1, 2, -1, 3], 0.0, [0, 3]),
+    ([np.nan, 1, np.nan, 1, 1], 0.0, [1, 3]),
+    ([0, 0, 0], 0.0, []),
+    ([4, 6, 5, 7, 3, 6], 5.0, [1, 3, 5]),
+    ([], 0.0, []),
+])
+def test_crossover_arrays(crossover, values, threshold, expected):
+    """Test the array crossover implementations against hand-checked indices."""
+    crossed = crossover(np.array(values, dtype=np.float64), threshold)
+    
+    assert crossed.dtype == bool
+    assert np.flatnonzero(crossed).tolist() == expected
+
+
+@pytest.mark.parametrize("crossover", CROSSOVER_IMPLS)
+def test_crossover_arrays_agree(crossover):
+    """Test that every implementation matches the reference loop on random data."""
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(1000)
+    values[rng.random(1000) < 0.05] = np.nan
     
-    for col in expected_columns:
-        assert col in df_with_indicators.columns
+    above = np.nan_to_num(values, nan=-np.inf) > 0.1
+    expected = above & ~np.concatenate(([False], above[:-1]))
     
-    assert len(df_with_indicators) == len(df)
+    assert (crossover(values, 0.1) == expected).all()
 
 
-def test_indicators_with_insufficient_data():
-    """Test indicators with insufficient data."""
-    df = pd.DataFrame({
-        'open': [100],
-        'high': [102],
-        'low': [98],
-        'close': [100],
-        'volume': [1000],
-    })
+EXPECTED_COLS = [
+    'TSI', 'TSI_signal', 'EWO', 'MA',
+    'TSI_crossover', 'TSI_crossunder',
+    'EWO_crossover', 'EWO_crossunder',
+]
+
+
+@pytest.fixture(params=[1, 100], ids=["insufficient_data", "100_bars"])
+def ohlcv_n(request):
+    """OHLCV frame with a single bar (too short for any indicator window) or 100 bars."""
+    if request.param == 1:
+        return pd.DataFrame({
+            'open': [100],
+            'high': [102],
+            'low': [98],
+            'close': [100],
+            'volume': [1000],
+        })
+    return request.getfixturevalue("ohlcv_100")
+
+
+def test_add_all_indicators(ohlcv_n):
+    """Test adding all indicators to a DataFrame, including with insufficient data."""
+    df_with_indicators = add_all_indicators(ohlcv_n)
     
-    df_with_indicators = add_all_indicators(df)
+    for col in EXPECTED_COLS:
+        assert col in df_with_indicators.columns
     
-    assert 'TSI' in df_with_indicators.columns
-    assert 'EWO' in df_with_indicators.columns
+    assert len(df_with_indicators) == len(ohlcv_n)
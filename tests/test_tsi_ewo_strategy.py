@@ -0,0 +1,121 @@
+import pytest
+import pandas as pd
+import numpy as np
+from src.strategies import tsi_ewo_strategy
+from src.strategies.base import NUMEXPR_MIN_ROWS
+from src.strategies.tsi_ewo_strategy import TSIEWOStrategy
+
+
+def _signal_frame(n, seed=0):
+    """Random TSI/EWO indicator frame with n hourly rows."""
+    rng = np.random.default_rng(seed)
+    ewo = rng.standard_normal(n)
+    ewo[::11] = np.nan
+    
+    return pd.DataFrame({
+        "close": 100 + rng.standard_normal(n).cumsum(),
+        "MA": 100 + rng.standard_normal(n).cumsum(),
+        "volume": rng.integers(1000, 10000, n),
+        "TSI": rng.uniform(-60, 60, n),
+        "EWO": ewo,
+        "TSI_crossover": rng.random(n) < 0.2,
+        "TSI_crossunder": rng.random(n) < 0.2,
+    }, index=pd.date_range("2024-01-01", periods=n, freq="1h"))
+
+
+@pytest.mark.parametrize("filters", [{}, {"use_ma_trend": True, "min_volume": 5000}])
+def test_numexpr_signals_match_numpy(monkeypatch, filters):
+    """Test that the numexpr path on long frames matches plain NumPy."""
+    pytest.importorskip("numexpr")
+    
+    df = _signal_frame(NUMEXPR_MIN_ROWS + 100)
+    strategy = TSIEWOStrategy({"filters": filters})
+    
+    fused = strategy.generate_signals(df)
+    monkeypatch.setattr(tsi_ewo_strategy, "ne", None)
+    plain = strategy.generate_signals(df)
+    
+    for side in ["long_entry", "long_exit", "short_entry", "short_exit"]:
+        assert fused[side].dtype == bool
+        assert (fused[side] == plain[side]).all()
+        assert fused[side].any()
+
+
+@pytest.mark.parametrize("ewo", [np.nan, None, pd.NA])
+def test_calculate_confidence_missing_ewo(ewo):
+    """Test that a missing EWO value scores like an absent EWO column."""
+    strategy = TSIEWOStrategy({})
+    
+    # 20/50 * 0.4 for TSI, plus the flat 0.3 EWO and 0.3 volume terms
+    assert strategy.calculate_confidence({"TSI": 20.0, "EWO": ewo}) == pytest.approx(0.76)
+    assert strategy.calculate_confidence({"TSI": 20.0}) == pytest.approx(0.76)
+
+
+def _with_last_row(df, **values):
+    """Copy of df with the given columns overwritten on its last row."""
+    df = df.copy()
+    for name, value in values.items():
+        df.loc[df.index[-1], name] = value
+    return df
+
+
+def test_extract_latest_signals_batch_matches_single(counting_manager):
+    """Test that batch extraction matches per-symbol extraction."""
+    manager = counting_manager(failing={"HK.00001"})
+    strategy = TSIEWOStrategy({"min_confidence": 0.4}, fundamentals_manager=manager)
+    df = strategy.generate_signals(_signal_frame(60))
+    
+    long_row = _with_last_row(df, long_entry=True, short_entry=False, TSI=20.0, EWO=3.0)
+    dfs = {
+        "HK.00700": long_row,
+        "HK.00001": long_row,
+        # No TSI column: scored as TSI=0 (confidence 0.45), not dropped as NaN
+        "HK.09988": _with_last_row(long_row, EWO=5.0).drop(columns="TSI"),
+        "HK.03690": _with_last_row(df, long_entry=False, short_entry=True, TSI=-30.0, EWO=-5.0),
+        # NaN TSI scores NaN confidence in both paths and never fires
+        "HK.00005": _with_last_row(long_row, TSI=np.nan),
+        "HK.00941": pd.DataFrame(),
+    }
+    
+    batch = strategy.extract_latest_signals_batch(dfs, "60min")
+    single = [
+        signal
+        for symbol, frame in dfs.items()
+        for signal in strategy.extract_latest_signals(frame, symbol, "60min")
+    ]
+    
+    assert [(s["symbol"], s["side"]) for s in batch] == [
+        ("HK.00700", "LONG"),
+        ("HK.00001", "SUPPRESSED"),
+        ("HK.09988", "LONG"),
+        ("HK.03690", "SHORT"),
+    ]
+    assert batch[2]["confidence"] == pytest.approx(0.45)
+    
+    # SUPPRESSED entries are stamped with datetime.now()
+    strip = lambda signals: [{**s, "timestamp": None} if s["side"] == "SUPPRESSED" else s for s in signals]
+    assert strip(batch) == strip(single)
+    
+    # Gate results were memoized by the batch pass; the single pass reused them
+    assert manager.calls == 5
+
+
+class _FixedConfidenceStrategy(TSIEWOStrategy):
+    """Subclass customizing confidence, as INDICATOR_GUIDE.md describes."""
+    
+    def calculate_confidence(self, row):
+        return 0.9
+
+
+def test_batch_uses_overridden_confidence():
+    """Test that batch extraction honours a subclass's calculate_confidence."""
+    strategy = _FixedConfidenceStrategy({"min_confidence": 0.8})
+    df = strategy.generate_signals(_signal_frame(60))
+    # Built-in scoring gives 0.3 + 0.3 + 0.04 here, below min_confidence
+    df_long = _with_last_row(df, long_entry=True, short_entry=False, TSI=5.0, EWO=np.nan)
+    
+    single = strategy.extract_latest_signals(df_long, "HK.00700", "60min")
+    batch = strategy.extract_latest_signals_batch({"HK.00700": df_long}, "60min")
+    
+    assert [s["confidence"] for s in single] == [0.9]
+    assert batch == single